@@ -21,16 +21,38 @@ const TopBar: React.FC = () => {
   const { weather } = useWeather();
   const { setSelectedFarmer } = useSelectedFarmer();
   const [farmers, setFarmers] = useState<any[]>([]);
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const { selectedFarmer } = useSelectedFarmer();
 
+  // The listing is keyset-paginated; fetch one page at a time
+  const fetchFarmers = async (cursor: number | null) => {
+    const query = cursor ? `?cursor=${cursor}` : '';
+    const res = await fetch(`http://localhost:5000/api/head/farmers/${user?.id}${query}`);
+    return res.json();
+  };
+
   useEffect(() => {
     if (role === 'head' && user?.id) {
-      fetch(`http://localhost:5000/api/head/farmers/${user.id}`)
-        .then(res => res.json())
-        .then(data => setFarmers(data.farmers));
+      fetchFarmers(null).then(data => {
+        setFarmers(data.farmers);
+        setNextCursor(data.next_cursor);
+      });
     }
   }, [role, user]);
 
+  const loadMoreFarmers = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const data = await fetchFarmers(nextCursor);
+      setFarmers(prev => [...prev, ...data.farmers]);
+      setNextCursor(data.next_cursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   return (
     <header className="h-16 bg-card border-b border-border flex items-center justify-between px-6">
       {/* Left Side */}
@@ -63,6 +85,20 @@ const TopBar: React.FC = () => {
           {farmer.full_name || farmer.username} – {farmer.village}
         </DropdownMenuItem>
       ))}
+
+      {nextCursor && (
+        <DropdownMenuItem
+          // Keep the menu open while the next page is appended
+          onSelect={e => {
+            e.preventDefault();
+            loadMoreFarmers();
+          }}
+          disabled={loadingMore}
+          className="cursor-pointer justify-center text-muted-foreground"
+        >
+          {loadingMore ? 'Loading…' : 'Load more'}
+        </DropdownMenuItem>
+      )}
     </DropdownMenuContent>
   </DropdownMenu>
 )}
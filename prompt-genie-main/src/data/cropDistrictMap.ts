@@ -1,135 +0,0 @@
-    // src/data/cropDistrictMap.ts
-    // Derived from districts_with_crops.csv (Karnataka)
-
-    export const cropDistrictMap: Record<string, string[]> = {
-    rice: [
-        'mandya',
-        'mysore',
-        'ramanagara',
-        'chamarajanagar',
-        'hassan',
-        'kolar',
-        'tumakuru',
-        'shivamogga',
-        'chikkamagaluru',
-        'davanagere'
-    ],
-
-    wheat: [
-        'dharwad',
-        'belagavi',
-        'vijayapura',
-        'bagalkot',
-        'kalaburagi',
-        'gadag',
-        'haveri'
-    ],
-
-    paddy: [
-        'mandya',
-        'mysore',
-        'hassan',
-        'raichur',
-        'koppal',
-        'ballari',
-        'shivamogga'
-    ],
-
-    arhar: [
-        'kalaburagi',
-        'bidar',
-        'yadgiri',
-        'raichur',
-        'bagalkot',
-        'vijayapura'
-    ],
-
-    green_gram: [
-        'kalaburagi',
-        'bidar',
-        'raichur',
-        'yadgiri',
-        'koppal',
-        'ballari'
-    ],
-
-    black_gram: [
-        'kalaburagi',
-        'bidar',
-        'raichur',
-        'yadgiri',
-        'koppal'
-    ],
-
-    bengal_gram: [
-        'kalaburagi',
-        'bidar',
-        'bagalkot',
-        'vijayapura',
-        'gadag'
-    ],
-
-    maize: [
-        'davanagere',
-        'hassan',
-        'chitradurga',
-        'shivamogga',
-        'tumakuru',
-        'belagavi'
-    ],
-
-    jowar: [
-        'kalaburagi',
-        'vijayapura',
-        'bagalkot',
-        'gadag',
-        'raichur'
-    ],
-
-    bajra: [
-        'kalaburagi',
-        'yadgiri',
-        'raichur',
-        'koppal'
-    ],
-
-    groundnut: [
-        'chitradurga',
-        'tumakuru',
-        'davanagere',
-        'kolar',
-        'chikkamagaluru'
-    ],
-
-    cotton: [
-        'ballari',
-        'raichur',
-        'yadgiri',
-        'koppal',
-        'vijayanagara',
-        'kalaburagi'
-    ],
-
-    onion: [
-        'belagavi',
-        'dharwad',
-        'gadag',
-        'haveri',
-        'chikkamagaluru'
-    ],
-
-    tomato: [
-        'kolar',
-        'chikkamagaluru',
-        'hassan',
-        'mysore',
-        'belagavi'
-    ],
-
-    sesamum: [
-        'raichur',
-        'yadgiri',
-        'kalaburagi',
-        'koppal'
-    ]
-    };
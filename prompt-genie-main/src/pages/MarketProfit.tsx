@@ -16,72 +16,41 @@ import {
   ResponsiveContainer
 } from 'recharts';
 
-import { cropDistrictMap } from '@/data/cropDistrictMap';
-
-/* =======================
-  District Master List
-======================= */
-
-const ALL_DISTRICTS = [
-  { value: 'bagalkot', label: 'Bagalkot District' },
-  { value: 'ballari', label: 'Ballari District' },
-  { value: 'belagavi', label: 'Belagavi District' },
-  { value: 'bangalore_city', label: 'Bangalore Urban' },
-  { value: 'bangalore_rural', label: 'Bangalore Rural' },
-  { value: 'bidar', label: 'Bidar District' },
-  { value: 'chamarajanagar', label: 'Chamarajanagar District' },
-  { value: 'chikballapur', label: 'Chikballapur District' },
-  { value: 'chikkamagaluru', label: 'Chikkamagaluru District' },
-  { value: 'chitradurga', label: 'Chitradurga District' },
-  { value: 'dakshina_kannada', label: 'Dakshina Kannada District' },
-  { value: 'davanagere', label: 'Davanagere District' },
-  { value: 'dharwad', label: 'Dharwad District' },
-  { value: 'gadag', label: 'Gadag District' },
-  { value: 'hassan', label: 'Hassan District' },
-  { value: 'haveri', label: 'Haveri District' },
-  { value: 'kalaburagi', label: 'Kalaburagi District' },
-  { value: 'kodagu', label: 'Kodagu District' },
-  { value: 'kolar', label: 'Kolar District' },
-  { value: 'koppal', label: 'Koppal District' },
-  { value: 'mandya', label: 'Mandya District' },
-  { value: 'mysore', label: 'Mysore District' },
-  { value: 'raichur', label: 'Raichur District' },
-  { value: 'ramanagara', label: 'Ramanagara District' },
-  { value: 'shivamogga', label: 'Shivamogga District' },
-  { value: 'tumakuru', label: 'Tumakuru District' },
-  { value: 'udupi', label: 'Udupi District' },
-  { value: 'uttara_kannada', label: 'Uttara Kannada District' },
-  { value: 'vijayanagara', label: 'Vijayanagara District' },
-  { value: 'vijayapura', label: 'Vijayapura District' },
-  { value: 'yadgiri', label: 'Yadgir District' }
-];
-
 const MarketProfit: React.FC = () => {
   const { t } = useLanguage();
 
   const [selectedCrop, setSelectedCrop] = useState('rice');
-  const [selectedDistrict, setSelectedDistrict] = useState('mysore');
+  const [selectedDistrict, setSelectedDistrict] = useState('Mysore');
+  const [availableDistricts, setAvailableDistricts] = useState<string[]>([]);
   const [loading, setLoading] = useState(false);
 
   const [predictionData, setPredictionData] = useState<any>(null);
   const [analysisData, setAnalysisData] = useState<any>(null);
 
   /* =======================
-     Filter districts by crop
-  ======================= */
-
-  const availableDistricts = ALL_DISTRICTS.filter(d =>
-    cropDistrictMap[selectedCrop]?.includes(d.value)
-  );
-
-  /* =======================
-     Auto-fix invalid district
+     Districts trading the crop
   ======================= */
 
   useEffect(() => {
-    if (!cropDistrictMap[selectedCrop]?.includes(selectedDistrict)) {
-      setSelectedDistrict(cropDistrictMap[selectedCrop][0]);
-    }
+    const loadDistricts = async () => {
+      try {
+        const res = await fetch(
+          `http://localhost:5000/districts?commodity=${encodeURIComponent(selectedCrop)}`
+        );
+        const data = await res.json();
+        const districts: string[] = data.districts ?? [];
+        setAvailableDistricts(districts);
+
+        // Auto-fix invalid district
+        if (districts.length && !districts.includes(selectedDistrict)) {
+          setSelectedDistrict(districts[0]);
+        }
+      } catch (error) {
+        console.error('Failed to fetch districts', error);
+        setAvailableDistricts([]);
+      }
+    };
+    loadDistricts();
   }, [selectedCrop]);
 
   /* =======================
@@ -170,8 +139,8 @@ const MarketProfit: React.FC = () => {
             onChange={(e) => setSelectedDistrict(e.target.value)}
           >
             {availableDistricts.map(d => (
-              <option key={d.value} value={d.value}>
-                {d.label}
+              <option key={d} value={d}>
+                {d} District
               </option>
             ))}
           </select>
@@ -1,9 +1,25 @@
 from flask import Flask
 from flask_cors import CORS # 1. Import CORS
-from werkzeug.security import generate_password_hash, check_password_hash
-from backend.database.db import get_db
+from backend.auth import (
+    hash_password, verify_password, AuthBusyError,
+    issue_token, session_from_request
+)
+from backend import http_client
+from backend.database.db import get_db, close_connection
+from backend.database.migrations import migrate
+from backend.database.queries import (
+    FARMER_SIGNUP_SQL, FARMER_LOGIN_SQL, HEAD_LOGIN_SQL, FARMER_LOCATION_SQL,
+    FARMER_EXISTS_SQL
+)
+from backend.database.access import sync_head_access, grant_new_farmer
+from backend.database.soil_writer import SoilReportWriter, QueueFullError
+from backend.database.farmers import list_head_farmers, farmer_locations, DEFAULT_PAGE_SIZE
+from backend.database import rollups
+from backend.districts import KARNATAKA_DISTRICTS
+from backend.weather.cache import WeatherCache
+from backend.weather.prefetch import WeatherPrefetcher, WEATHER_PREFETCH
+from backend.weather.provider import WeatherProvider
 from flask import jsonify, request
-<<<<<<< HEAD
 try:
     from backend.disease_classifier import diagnose_plant_image
 except Exception as e:
@@ -19,11 +35,17 @@ except Exception as e:
         return {"sentiment": "N/A", "analysis": "Module unavailable"}
 
 try:
-    from backend.price_predictor.app import predict
+    from backend.price_predictor.app import (
+        predict, predict_district, cache_stats as price_cache_stats,
+        districts as price_districts, commodities as price_commodities
+    )
 except Exception as e:
     print(f"WARNING: Price predictor module could not be loaded: {e}")
     def predict(district, commodity):
         return {"error": "Price predictor module unavailable"}
+    def price_cache_stats():
+        return None
+    predict_district = price_districts = price_commodities = None
 
 try:
     from backend.shelf_life_integration import shelf_life_service
@@ -31,17 +53,13 @@ except Exception as e:
     print(f"WARNING: Shelf life service could not be loaded: {e}")
     shelf_life_service = None
 
-=======
-from backend.disease_classifier import diagnose_plant_image
-from backend.sentiment_analyser_model import analyze_crop
-from backend.price_predictor.app import predict
->>>>>>> 275b2b8fe38f187a469b7f1a67a8f35f99b033ee
 import google.generativeai as genai
 import requests
+import atexit
 import os
 import pickle
+import sqlite3
 import sys
-<<<<<<< HEAD
 try:
     from backend.surplus_deficit.scripts.visualization_routes import (
         visualize_routes_with_farmer_highlight
@@ -50,57 +68,31 @@ except ImportError:
     print("WARNING: Visualization routes module not found.")
     def visualize_routes_with_farmer_highlight(farmer_city=None, output_dir=None):
         return "map_unavailable.html"
-=======
-from backend.surplus_deficit.scripts.visualization_routes import (
-    visualize_routes_with_farmer_highlight
-)
->>>>>>> 275b2b8fe38f187a469b7f1a67a8f35f99b033ee
-
-
-
-KARNATAKA_DISTRICTS = {
-    "Bengaluru Urban": {"lat": 12.9716, "lon": 77.5946},
-    "Bengaluru Rural": {"lat": 13.2846, "lon": 77.6070},
-    "Mysuru": {"lat": 12.2958, "lon": 76.6394},
-    "Mandya": {"lat": 12.5223, "lon": 76.8974},
-    "Tumakuru": {"lat": 13.3392, "lon": 77.1130},
-    "Hassan": {"lat": 13.0068, "lon": 76.0996},
-    "Shivamogga": {"lat": 13.9299, "lon": 75.5681},
-    "Chitradurga": {"lat": 14.2306, "lon": 76.3986},
-    "Davanagere": {"lat": 14.4644, "lon": 75.9218},
-    "Ballari": {"lat": 15.1394, "lon": 76.9214},
-    "Vijayapura": {"lat": 16.8302, "lon": 75.7100},
-    "Belagavi": {"lat": 15.8497, "lon": 74.4977},
-    "Dharwad": {"lat": 15.4589, "lon": 75.0078},
-    "Kalaburagi": {"lat": 17.3297, "lon": 76.8343},
-    "Raichur": {"lat": 16.2076, "lon": 77.3463},
-    "Bidar": {"lat": 17.9149, "lon": 77.5046},
-    "Kolar": {"lat": 13.1357, "lon": 78.1326},
-    "Chikkaballapur": {"lat": 13.4355, "lon": 77.7315},
-    "Udupi": {"lat": 13.3409, "lon": 74.7421},
-    "Dakshina Kannada": {"lat": 12.8438, "lon": 75.2479},
-    "Kodagu": {"lat": 12.3375, "lon": 75.8069}
-}
 
 
 
 app = Flask(__name__)
 CORS(app) # 2. Enable CORS
 
+# Pooled DB connections go back to the pool at the end of every request
+app.teardown_appcontext(close_connection)
+
+# Bring the database schema up to date before serving requests
+with get_db() as conn:
+    migrate(conn)
+
+# Soil reports are committed in batches by a background writer, started by
+# the first report in each worker; atexit drains whatever is still queued.
+soil_writer = SoilReportWriter()
+atexit.register(soil_writer.stop)
+
 #genai API CONFIG
-<<<<<<< HEAD
 #genai API CONFIG
 api_key = os.environ.get("GOOGLE_API_KEY")
 if not api_key:
     print("WARNING: GOOGLE_API_KEY not set in environment. AI features will not work.")
 else:
     genai.configure(api_key=api_key)
-=======
-api_key = os.environ.get("GOOGLE_API_KEY")
-if not api_key:
-    raise RuntimeError("GOOGLE_API_KEY not set in environment")
-genai.configure(api_key=api_key)
->>>>>>> 275b2b8fe38f187a469b7f1a67a8f35f99b033ee
 
 
 
@@ -180,48 +172,31 @@ IMPACT_MAP = {
 
 
 
+# One shared entry per district centroid (see backend/weather/cache.py)
+weather_cache = WeatherCache()
+
+# All district centroids are refreshed together in the background
+# (see backend/weather/prefetch.py); requests read the snapshot. Each worker
+# starts its own thread on its first weather lookup.
+weather_prefetcher = WeatherPrefetcher(cache=weather_cache, autostart=WEATHER_PREFETCH)
+atexit.register(weather_prefetcher.stop)
+
+# Upper bound for explicit farmer_ids lists in /api/weather/batch
+MAX_BATCH_FARMERS = int(os.environ.get("MAX_BATCH_FARMERS", 10000))
+
+# Dashboard and shelf-life weather share one provider and one cache
+weather_provider = WeatherProvider(cache=weather_cache, prefetcher=weather_prefetcher)
+if shelf_life_service:
+    shelf_life_service.weather = weather_provider
+
+
 def get_weather(lat, lon):
     """
-    Fetch weather data using latitude and longitude
+    Weather for a location: prefetched snapshot first, then the
+    district-keyed cache
     """
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "current": ["temperature_2m", "wind_speed_10m", "relative_humidity_2m"],
-        "daily": ["temperature_2m_max", "temperature_2m_min", "precipitation_sum"],
-        "timezone": "auto",
-        "forecast_days": 7
-    }
-
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-
-        current = data.get("current", {})
-        daily = data.get("daily", {})
-
-        forecast = []
-        for i in range(len(daily.get("time", []))):
-            forecast.append({
-                "date": daily["time"][i],
-                "temp_max": daily["temperature_2m_max"][i],
-                "temp_min": daily["temperature_2m_min"][i],
-                "precipitation": daily["precipitation_sum"][i]
-            })
-
-        return {
-            "current_weather": {
-                "time": current.get("time"),
-                "temperature": current.get("temperature_2m"),
-                "wind_speed": current.get("wind_speed_10m"),
-                "humidity": current.get("relative_humidity_2m"),
-                "unit": "°C"
-            },
-            "seven_day_forecast": forecast
-        }
-
+        return weather_provider.forecast(lat, lon)
     except requests.exceptions.RequestException as e:
         return {"error": f"Failed to retrieve data: {str(e)}"}
 
@@ -230,6 +205,13 @@ def get_weather(lat, lon):
 #===========================================
 #                   ROUTES 
 #===========================================
+@app.errorhandler(AuthBusyError)
+def auth_busy(e):
+    return jsonify({
+        "error": str(e)
+    }), 503, {"Retry-After": "1"}
+
+
 @app.route("/api/auth/farmer/signup", methods=["POST"])
 def farmer_signup():
     data = request.get_json()
@@ -255,48 +237,37 @@ def farmer_signup():
     latitude = KARNATAKA_DISTRICTS[district]["lat"]
     longitude = KARNATAKA_DISTRICTS[district]["lon"]
 
-    password_hash = generate_password_hash(password)
-
-    conn = get_db()
-    cursor = conn.cursor()
+    password_hash = hash_password(password)
 
     try:
-        cursor.execute("""
-            INSERT INTO farmers (
-                username, password_hash,
-                full_name, village, district,
-                latitude, longitude
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            username,
-            password_hash,
-            data.get("full_name"),
-            data["village"],
-            district,
-            latitude,
-            longitude
-        ))
-
-        conn.commit()
+        with get_db() as conn:
+            cursor = conn.execute(FARMER_SIGNUP_SQL, (
+                username,
+                password_hash,
+                data.get("full_name"),
+                data["village"],
+                district,
+                latitude,
+                longitude
+            ))
 
-        return jsonify({
-            "success": True,
-            "message": "Farmer account created successfully",
-            "location": {
-                "district": district,
-                "latitude": latitude,
-                "longitude": longitude
-            }
-        }), 201
-
-    except Exception:
+            # Existing heads see the new farmer right away
+            grant_new_farmer(conn, cursor.lastrowid)
+
+    except sqlite3.IntegrityError:
         return jsonify({
             "error": "Username already exists"
         }), 409
 
-    finally:
-        conn.close()
+    return jsonify({
+        "success": True,
+        "message": "Farmer account created successfully",
+        "location": {
+            "district": district,
+            "latitude": latitude,
+            "longitude": longitude
+        }
+    }), 201
 
 
 @app.route("/api/auth/farmer/login", methods=["POST"])
@@ -308,30 +279,31 @@ def farmer_login():
             "error": "Username and password required"
         }), 400
 
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT id, username, password_hash, village, district
-        FROM farmers
-        WHERE username = ? AND is_active = 1
-    """, (data["username"],))
-
-    farmer = cursor.fetchone()
-    conn.close()
+    with get_db() as conn:
+        farmer = conn.execute(FARMER_LOGIN_SQL, (data["username"],)).fetchone()
 
     if not farmer:
         return jsonify({
             "error": "Invalid username or password"
         }), 401
 
-    if not check_password_hash(farmer["password_hash"], data["password"]):
+    if not verify_password(farmer["password_hash"], data["password"]):
         return jsonify({
             "error": "Invalid username or password"
         }), 401
 
+    # Follow-up calls send this back instead of re-querying the farmer
+    token = issue_token({
+        "role": "farmer",
+        "id": farmer["id"],
+        "district": farmer["district"],
+        "lat": farmer["latitude"],
+        "lon": farmer["longitude"]
+    })
+
     return jsonify({
         "success": True,
+        "token": token,
         "farmer": {
             "id": farmer["id"],
             "username": farmer["username"],
@@ -358,39 +330,32 @@ def farmer_head_signup():
     password = data["password"]
     role = data.get("role", "head")
 
-    password_hash = generate_password_hash(password)
-
-    conn = get_db()
-    cursor = conn.cursor()
+    password_hash = hash_password(password)
 
     try:
-        cursor.execute("""
-            INSERT INTO farmer_heads (
-                username, password_hash,
-                full_name, role
-            )
-            VALUES (?, ?, ?, ?)
-        """, (
-            username,
-            password_hash,
-            data.get("full_name"),
-            role
-        ))
-
-        conn.commit()
-
-        return jsonify({
-            "success": True,
-            "message": "Farmer head account created successfully"
-        }), 201
+        with get_db() as conn:
+            conn.execute("""
+                INSERT INTO farmer_heads (
+                    username, password_hash,
+                    full_name, role
+                )
+                VALUES (?, ?, ?, ?)
+            """, (
+                username,
+                password_hash,
+                data.get("full_name"),
+                role
+            ))
 
-    except Exception:
+    except sqlite3.IntegrityError:
         return jsonify({
             "error": "Username already exists"
         }), 409
 
-    finally:
-        conn.close()
+    return jsonify({
+        "success": True,
+        "message": "Farmer head account created successfully"
+    }), 201
 
 
 @app.route("/api/auth/head/login", methods=["POST"])
@@ -402,56 +367,30 @@ def farmer_head_login():
             "error": "Username and password required"
         }), 400
 
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT id, username, password_hash, full_name, role
-        FROM farmer_heads
-        WHERE username = ? AND is_active = 1
-    """, (data["username"],))
-
-    head = cursor.fetchone()
-    conn.close()
+    with get_db() as conn:
+        head = conn.execute(HEAD_LOGIN_SQL, (data["username"],)).fetchone()
 
     if not head:
         return jsonify({
             "error": "Invalid username or password"
         }), 401
 
-    if not check_password_hash(head["password_hash"], data["password"]):
+    if not verify_password(head["password_hash"], data["password"]):
         return jsonify({
             "error": "Invalid username or password"
         }), 401
     
     # AUTO-ASSIGN ALL FARMERS TO THIS HEAD
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT id FROM farmers WHERE is_active = 1")
-    farmers = cursor.fetchall()
+    # (only farmers created since this head's last sync are considered)
+    with get_db() as conn:
+        sync_head_access(conn, head["id"])
 
-    for farmer in farmers:
-        try:
-            cursor.execute("""
-                INSERT OR IGNORE INTO farmer_access (
-                    head_id,
-                    farmer_id,
-                    can_view_soil,
-                    can_view_crops,
-                    can_view_disease
-                )
-                VALUES (?, ?, 1, 1, 1)
-            """, (head["id"], farmer["id"]))
-        except Exception:
-            pass
-
-    conn.commit()
-    conn.close()
 
+    token = issue_token({"role": "head", "id": head["id"]})
 
     return jsonify({
         "success": True,
+        "token": token,
         "head": {
             "id": head["id"],
             "username": head["username"],
@@ -469,23 +408,25 @@ def analyze(crop: str):
 @app.route("/api/weather", methods=["GET"])
 def weather():
     farmer_id = request.args.get("farmer_id")
+    session = session_from_request(request)
+
+    # A farmer's own token already carries their coordinates
+    if session and session["role"] == "farmer" and farmer_id in (None, str(session["id"])):
+        if session["lat"] is None or session["lon"] is None:
+            return jsonify({
+                "error": "Location not available for this farmer"
+            }), 400
+        return jsonify(
+            get_weather(session["lat"], session["lon"])
+        )
 
     if not farmer_id:
         return jsonify({
             "error": "farmer_id query parameter is required"
         }), 400
 
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT latitude, longitude, district
-        FROM farmers
-        WHERE id = ? AND is_active = 1
-    """, (farmer_id,))
-
-    farmer = cursor.fetchone()
-    conn.close()
+    with get_db() as conn:
+        farmer = conn.execute(FARMER_LOCATION_SQL, (farmer_id,)).fetchone()
 
     if not farmer:
         return jsonify({
@@ -502,6 +443,80 @@ def weather():
         get_weather(farmer["latitude"], farmer["longitude"])
     )
 
+
+@app.route("/api/weather/batch", methods=["GET", "POST"])
+def weather_batch():
+    """
+    Weather for many farmers in one call.
+
+    Query params (GET) or JSON body (POST):
+        head_id      every active farmer visible to this head, or
+        farmer_ids   comma-separated ids (GET) / list of ids (POST)
+
+    Farmers are resolved in one query and weather is looked up once per
+    district: `weather` holds one entry per district and each farmer points
+    at theirs, which keeps a 10k-farmer response small.
+    """
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify({
+            "error": "Request body must be a JSON object"
+        }), 400
+    head_id = body.get("head_id", request.args.get("head_id"))
+    farmer_ids = body.get("farmer_ids", request.args.get("farmer_ids"))
+
+    try:
+        if head_id is not None:
+            head_id = int(head_id)
+            farmer_ids = None
+        elif farmer_ids:
+            if isinstance(farmer_ids, str):
+                farmer_ids = farmer_ids.split(",")
+            farmer_ids = [int(i) for i in farmer_ids]
+        else:
+            return jsonify({
+                "error": "head_id or farmer_ids is required"
+            }), 400
+    except (TypeError, ValueError):
+        return jsonify({
+            "error": "head_id and farmer_ids must be integers"
+        }), 400
+
+    if farmer_ids and len(farmer_ids) > MAX_BATCH_FARMERS:
+        return jsonify({
+            "error": f"At most {MAX_BATCH_FARMERS} farmer_ids per request"
+        }), 400
+
+    session = session_from_request(request)
+    if head_id is not None and session and not (session["role"] == "head" and session["id"] == head_id):
+        return jsonify({
+            "error": "Token does not belong to this head"
+        }), 403
+
+    with get_db() as conn:
+        rows = farmer_locations(conn, head_id=head_id, farmer_ids=farmer_ids)
+
+    weather_by_district = {}
+    farmers = []
+    missing_location = []
+    for farmer_id, district, lat, lon in rows:
+        if lat is None or lon is None:
+            missing_location.append(farmer_id)
+            continue
+        if district not in weather_by_district:
+            weather_by_district[district] = get_weather(lat, lon)
+        farmers.append({"farmer_id": farmer_id, "district": district})
+
+    response = {
+        "weather": weather_by_district,
+        "farmers": farmers,
+        "missing_location": missing_location
+    }
+    if farmer_ids:
+        found = {row[0] for row in rows}
+        response["not_found"] = [i for i in dict.fromkeys(farmer_ids) if i not in found]
+    return jsonify(response)
+
 from flask import request
 
 @app.get("/predict")
@@ -517,6 +532,37 @@ def prediction():
     return predict(district, commodity)
 
 
+@app.get("/predict/district/<district>")
+def district_prediction(district):
+    """Ranked forecasts for every commodity traded in the district."""
+    if predict_district is None:
+        return {"error": "Price predictor module unavailable"}, 503
+
+    result = predict_district(district)
+    if result is None:
+        return {"error": f"No price history for district: {district}"}, 404
+    return result
+
+
+@app.get("/districts")
+def market_districts():
+    """Districts with price history; ?commodity= keeps those trading it."""
+    if price_districts is None:
+        return {"error": "Price predictor module unavailable"}, 503
+    return {"districts": price_districts(request.args.get("commodity"))}
+
+
+@app.get("/commodities/<district>")
+def market_commodities(district):
+    if price_commodities is None:
+        return {"error": "Price predictor module unavailable"}, 503
+
+    entries = price_commodities(district)
+    if entries is None:
+        return {"error": f"No price history for district: {district}"}, 404
+    return {"district": district.strip().replace("_", " ").title(), "commodities": entries}
+
+
 @app.route("/api/assistant", methods=["POST"])
 def assistant():
     data = request.get_json()
@@ -538,7 +584,6 @@ Rules:
 User question:
 {user_message}
 """
-<<<<<<< HEAD
     if not api_key:
         return jsonify({"reply": "I'm sorry, I cannot answer questions right now because the API key is missing."})
 
@@ -547,10 +592,6 @@ User question:
         response = model.generate_content(prompt)
     except Exception as e:
         return jsonify({"reply": f"Error communicating with AI: {str(e)}"})
-=======
-    model = genai.GenerativeModel("gemini-2.5-flash")
-    response = model.generate_content(prompt)
->>>>>>> 275b2b8fe38f187a469b7f1a67a8f35f99b033ee
 
     return jsonify({
         "reply": response.text
@@ -579,7 +620,6 @@ def diagnose():
         Keep it very brief (max 100 words).
         """
         
-<<<<<<< HEAD
         if api_key:
             try:
                 model = genai.GenerativeModel("gemini-2.5-flash")
@@ -589,11 +629,6 @@ def diagnose():
                 result["karnataka_advice"] = f"Could not fetch advice: {str(e)}"
         else:
              result["karnataka_advice"] = "AI advice unavailable (Missing API Key)."
-=======
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        ai_response = model.generate_content(local_prompt)
-        result["karnataka_advice"] = ai_response.text
->>>>>>> 275b2b8fe38f187a469b7f1a67a8f35f99b033ee
     return jsonify(result)
 
 
@@ -618,6 +653,10 @@ def soil_nutrient_recommendation():
         print("_______________________________________________________________________________")
         data = request.get_json()
         # Validate required fields
+        session = session_from_request(request)
+        if session and session["role"] == "farmer" and "farmer_id" not in data:
+            data["farmer_id"] = session["id"]
+
         required_fields = [
             "farmer_id",
             "nitrogen", "phosphorus", "potassium",
@@ -635,6 +674,22 @@ def soil_nutrient_recommendation():
             return jsonify({
                 "error": "farmer_id must be a valid integer"
             }), 400
+
+        if session and session["role"] == "farmer" and session["id"] != farmer_id:
+            return jsonify({
+                "error": "Token does not belong to this farmer"
+            }), 403
+
+        # The writer inserts after this route has answered, so an unknown
+        # farmer has to be rejected here rather than dropped later. A farmer
+        # token (checked above to match) already vouches for the account.
+        if not (session and session["role"] == "farmer"):
+            with get_db() as conn:
+                farmer_exists = conn.execute(FARMER_EXISTS_SQL, (farmer_id,)).fetchone()
+            if not farmer_exists:
+                return jsonify({
+                    "error": "Invalid farmer_id"
+                }), 404
         
         print("RAW REQUEST DATA:", data)
 
@@ -714,29 +769,20 @@ def soil_nutrient_recommendation():
             })
         
 
-        #insert into database
+        #queue for the background writer (committed in batches)
         try:
-            conn = get_db()
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT INTO soil_reports (
-                    farmer_id,
-                    nitrogen, phosphorus, potassium,
-                    ph, temperature, humidity, rainfall,
-                    soil_health_score, confidence_percentage
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            soil_writer.submit((
                 farmer_id,
                 N, P, K,
                 ph, temperature, humidity, rainfall,
                 health_score, confidence
             ))
-
-            conn.commit()
-            conn.close()
-            print(f"✅ Soil report saved successfully for farmer_id: {farmer_id}")
+            print(f"✅ Soil report queued for farmer_id: {farmer_id}")
+        except QueueFullError as queue_error:
+            print(f"❌ Soil report queue full: {str(queue_error)}")
+            return jsonify({
+                "error": "Too many soil reports are being saved right now, please retry shortly"
+            }), 503, {"Retry-After": "1"}
         except Exception as db_error:
             print(f"❌ Database error while saving soil report: {str(db_error)}")
             return jsonify({
@@ -811,7 +857,6 @@ def get_logistics_map():
             "error": f"Failed to generate map: {str(e)}"
         }), 500
 
-<<<<<<< HEAD
 @app.route("/api/shelf-life/predict", methods=["POST"])
 def predict_shelf_life_route():
     if not shelf_life_service:
@@ -831,28 +876,85 @@ def predict_shelf_life_route():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-=======
->>>>>>> 275b2b8fe38f187a469b7f1a67a8f35f99b033ee
+@app.route("/api/soil/rollups", methods=["GET"])
+def soil_rollups():
+    """
+    District soil health aggregates, served from the rollup tables.
+
+    Without params: one row per district.
+    ?district=X[&days=30]: that district's summary plus its daily trend.
+    """
+    district = request.args.get("district")
+
+    try:
+        days = int(request.args.get("days", 30))
+    except ValueError:
+        return jsonify({
+            "error": "days must be an integer"
+        }), 400
+
+    with get_db() as conn:
+        districts = rollups.district_summaries(conn, district)
+        daily = rollups.district_daily(conn, district, days) if district else None
+
+    response = {"districts": districts}
+    if daily is not None:
+        response["daily"] = daily
+    return jsonify(response)
+
+
+@app.route("/api/metrics", methods=["GET"])
+def metrics():
+    return jsonify({
+        "soil_writer": soil_writer.stats(),
+        "weather_cache": weather_cache.stats(),
+        "weather_prefetch": weather_prefetcher.stats(),
+        "weather_archive": weather_provider.archive.stats(),
+        "price_forecast_cache": price_cache_stats(),
+        "http": http_client.stats()
+    })
+
+
 @app.route("/api/head/farmers/<int:head_id>", methods=["GET"])
 def get_farmers_for_head(head_id):
-    conn = get_db()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT
-            f.id,
-            f.full_name,
-            f.village,
-            f.district
-        FROM farmer_access fa
-        JOIN farmers f ON fa.farmer_id = f.id
-        WHERE fa.head_id = ?
-    """, (head_id,))
-
-    farmers = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-
-    return jsonify({ "farmers": farmers })
+    """
+    Keyset-paginated farmers visible to a head.
+
+    Query params:
+        limit    page size (default 100, max 500)
+        cursor   `next_cursor` from the previous page
+        district, village   optional exact-match filters
+        include=summary     embed latest soil health score and disease report count
+    """
+    session = session_from_request(request)
+    if session and not (session["role"] == "head" and session["id"] == head_id):
+        return jsonify({
+            "error": "Token does not belong to this head"
+        }), 403
+
+    try:
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+        cursor = int(request.args.get("cursor", 0))
+    except ValueError:
+        return jsonify({
+            "error": "limit and cursor must be integers"
+        }), 400
+
+    with get_db() as conn:
+        farmers, next_cursor = list_head_farmers(
+            conn,
+            head_id,
+            cursor=cursor,
+            limit=limit,
+            district=request.args.get("district"),
+            village=request.args.get("village"),
+            with_summary=request.args.get("include") == "summary"
+        )
+
+    return jsonify({
+        "farmers": farmers,
+        "next_cursor": next_cursor
+    })
 
 
 if __name__ == "__main__":
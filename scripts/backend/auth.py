@@ -0,0 +1,114 @@
+"""
+Password hashing off the request thread, and signed session tokens.
+
+werkzeug's password hashes are deliberately slow and hold the GIL, so a
+burst of logins stalls every other request in the worker. hash_password()
+and verify_password() run them in a process pool instead, with at most
+AUTH_MAX_PENDING hashes queued per worker; beyond that AuthBusyError is
+raised and the route answers 503.
+
+After a successful login the client receives a signed token carrying the
+account id (and, for farmers, their district coordinates). Follow-up calls
+send it as `Authorization: Bearer <token>` so routes can skip both the
+password check and the farmers lookup.
+"""
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from werkzeug.security import generate_password_hash, check_password_hash
+
+HASH_WORKERS = int(os.environ.get("AUTH_HASH_WORKERS", os.cpu_count() or 1))
+MAX_PENDING = int(os.environ.get("AUTH_MAX_PENDING", HASH_WORKERS * 4))
+QUEUE_TIMEOUT = float(os.environ.get("AUTH_QUEUE_TIMEOUT", 10))
+
+SESSION_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", 12 * 3600))
+SESSION_SECRET = os.environ.get("SESSION_SECRET")
+if not SESSION_SECRET:
+    print("WARNING: SESSION_SECRET not set. Session tokens will not survive restarts "
+          "or be shared between workers.")
+    SESSION_SECRET = secrets.token_hex(32)
+
+_serializer = URLSafeTimedSerializer(SESSION_SECRET, salt="agriverse-session")
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_PENDING)
+
+
+class AuthBusyError(Exception):
+    """Raised when too many password hashes are already in flight."""
+
+
+def _get_executor():
+    """One pool per worker process (gunicorn forks after import)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            # By now the worker runs request and background threads; forking
+            # it for the pool could copy a held lock into the children
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                # Children re-import the main script (`python app.py`); do it
+                # once in the server rather than in every hash worker
+                context.set_forkserver_preload(["__main__"])
+            else:
+                context = multiprocessing.get_context("spawn")
+            _executor = ProcessPoolExecutor(max_workers=HASH_WORKERS, mp_context=context)
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _run(fn, *args):
+    if not _slots.acquire(timeout=QUEUE_TIMEOUT):
+        raise AuthBusyError("Too many login requests, please retry shortly")
+    try:
+        if HASH_WORKERS <= 0:
+            return fn(*args)
+        return _get_executor().submit(fn, *args).result()
+    finally:
+        _slots.release()
+
+
+def hash_password(password):
+    return _run(generate_password_hash, password)
+
+
+def verify_password(password_hash, password):
+    return _run(check_password_hash, password_hash, password)
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+# ==========================================================
+# SESSION TOKENS
+# ==========================================================
+def issue_token(claims):
+    """Sign `claims` (a small JSON-able dict, e.g. role + id)."""
+    return _serializer.dumps(claims)
+
+
+def read_token(token):
+    """Return the claims of a valid, unexpired token, else None."""
+    try:
+        return _serializer.loads(token, max_age=SESSION_TTL_SECONDS)
+    except (BadSignature, SignatureExpired):
+        return None
+
+
+def session_from_request(request):
+    """Claims from the request's `Authorization: Bearer` header, if valid."""
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Bearer "):
+        return None
+    return read_token(header[len("Bearer "):].strip())
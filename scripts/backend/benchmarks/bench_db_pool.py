@@ -0,0 +1,134 @@
+"""
+Request throughput for /api/weather and /nutrient, before and after the
+pooled WAL connection layer.
+
+"before" patches the routes with the old connect-per-request get_db (and a
+synchronous soil report insert) on a rollback-journal copy of the database;
+"after" uses backend.database.db and the batched SoilReportWriter.
+The upstream weather call is stubbed so only the request + SQL path is timed.
+
+Run from scripts/:
+    python -m backend.benchmarks.bench_db_pool --requests 2000 --threads 4
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from backend.database import db
+from backend.database.soil_writer import SoilReportWriter, INSERT_SQL
+import backend.app as backend_app
+
+SOIL_PAYLOAD = {
+    "farmer_id": 1,
+    "nitrogen": 40, "phosphorus": 25, "potassium": 60,
+    "temperature": 27, "humidity": 70, "ph": 6.5, "rainfall": 120
+}
+
+
+def legacy_get_db_factory(path):
+    @contextmanager
+    def legacy_get_db():
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+    return legacy_get_db
+
+
+class LegacySoilWriter:
+    """Synchronous INSERT + commit per report, as /nutrient used to do."""
+
+    def __init__(self, get_db):
+        self.get_db = get_db
+
+    def submit(self, report):
+        with self.get_db() as conn:
+            conn.execute(INSERT_SQL, report)
+
+
+def prepare_copy(tmp_dir, name, journal_mode):
+    path = os.path.join(tmp_dir, name)
+    shutil.copy(db.DB_PATH, path)
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    farmer = conn.execute("SELECT id FROM farmers WHERE is_active = 1 LIMIT 1").fetchone()
+    conn.close()
+    return path, (farmer[0] if farmer else 1)
+
+
+def run(client_factory, farmer_id, total, threads):
+    per_thread = total // threads
+    counts = {"weather": 0, "nutrient": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def worker():
+        client = client_factory()
+        local = {"weather": 0, "nutrient": 0, "errors": 0}
+        for i in range(per_thread):
+            if i % 2:
+                r = client.get(f"/api/weather?farmer_id={farmer_id}")
+                local["weather"] += 1
+            else:
+                r = client.post("/nutrient", json=dict(SOIL_PAYLOAD, farmer_id=farmer_id))
+                local["nutrient"] += 1
+            if r.status_code >= 400:
+                local["errors"] += 1
+        with lock:
+            for k, v in local.items():
+                counts[k] += v
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    backend_app.get_weather = lambda lat, lon: {"current_weather": {}, "seven_day_forecast": []}
+    backend_app.print = lambda *a, **k: None  # silence per-request logging
+    client_factory = backend_app.app.test_client
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path, farmer_id = prepare_copy(tmp_dir, "legacy.db", "DELETE")
+        pooled_path, _ = prepare_copy(tmp_dir, "pooled.db", "WAL")
+
+        original_get_db = backend_app.get_db
+        original_writer = backend_app.soil_writer
+        backend_app.get_db = legacy_get_db_factory(legacy_path)
+        backend_app.soil_writer = LegacySoilWriter(backend_app.get_db)
+        before, before_counts = run(client_factory, farmer_id, args.requests, args.threads)
+
+        backend_app.get_db = original_get_db
+        db.DB_PATH = pooled_path
+        backend_app.soil_writer = SoilReportWriter(db_path=pooled_path).start()
+        after, after_counts = run(client_factory, farmer_id, args.requests, args.threads)
+        backend_app.soil_writer.stop()
+        backend_app.soil_writer = original_writer
+
+    print(f"{'mode':<10}{'req/s':>10}{'weather':>10}{'nutrient':>10}{'errors':>8}")
+    for name, elapsed, counts in (("before", before, before_counts), ("after", after, after_counts)):
+        total = counts["weather"] + counts["nutrient"]
+        print(f"{name:<10}{total / elapsed:>10.0f}{counts['weather']:>10}"
+              f"{counts['nutrient']:>10}{counts['errors']:>8}")
+    print(f"speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
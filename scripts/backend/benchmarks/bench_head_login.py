@@ -0,0 +1,97 @@
+"""
+Head login access-grant cost with a large farmer table.
+
+Compares the old per-farmer INSERT loop with database.access on a scratch
+database holding --farmers rows:
+  - first login (full backfill for a new head)
+  - repeat login (nothing new)
+  - login after --new farmers signed up
+
+Run from scripts/:
+    python -m backend.benchmarks.bench_head_login --farmers 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from backend.database.db import connect
+from backend.database.migrations import migrate
+from backend.database.access import sync_head_access, grant_new_farmer
+
+
+def legacy_grant(conn, head_id):
+    farmers = conn.execute("SELECT id FROM farmers WHERE is_active = 1").fetchall()
+    for farmer in farmers:
+        conn.execute("""
+            INSERT OR IGNORE INTO farmer_access (
+                head_id, farmer_id,
+                can_view_soil, can_view_crops, can_view_disease
+            )
+            VALUES (?, ?, 1, 1, 1)
+        """, (head_id, farmer[0]))
+    conn.commit()
+
+
+def engine_grant(conn, head_id):
+    sync_head_access(conn, head_id)
+    conn.commit()
+
+
+def add_farmers(conn, start, count, on_insert=None):
+    for i in range(start, start + count):
+        cursor = conn.execute("""
+            INSERT INTO farmers (username, password_hash, village, district)
+            VALUES (?, 'x', 'village', 'Mandya')
+        """, (f"farmer{i}",))
+        if on_insert:
+            on_insert(conn, cursor.lastrowid)
+    conn.commit()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(path, farmers, new, grant, signup_hook):
+    conn = connect(path)
+    migrate(conn)
+    add_farmers(conn, 0, farmers)
+    conn.execute("INSERT INTO farmer_heads (username, password_hash) VALUES ('head', 'x')")
+    conn.commit()
+    head_id = conn.execute("SELECT id FROM farmer_heads").fetchone()[0]
+
+    first = timed(grant, conn, head_id)
+    repeat = timed(grant, conn, head_id)
+    add_farmers(conn, farmers, new, signup_hook)
+    after_signups = timed(grant, conn, head_id)
+
+    granted = conn.execute(
+        "SELECT COUNT(*) FROM farmer_access WHERE head_id = ?", (head_id,)
+    ).fetchone()[0]
+    conn.close()
+    return first, repeat, after_signups, granted
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--farmers", type=int, default=100_000)
+    parser.add_argument("--new", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy = run(os.path.join(tmp_dir, "legacy.db"), args.farmers, args.new,
+                     legacy_grant, None)
+        engine = run(os.path.join(tmp_dir, "engine.db"), args.farmers, args.new,
+                     engine_grant, grant_new_farmer)
+
+    print(f"{args.farmers} farmers, {args.new} new signups")
+    print(f"{'mode':<8}{'first ms':>12}{'repeat ms':>12}{'after new ms':>14}{'grants':>10}")
+    for name, (first, repeat, after, granted) in (("legacy", legacy), ("engine", engine)):
+        print(f"{name:<8}{first:>12.1f}{repeat:>12.1f}{after:>14.1f}{granted:>10}")
+
+
+if __name__ == "__main__":
+    main()
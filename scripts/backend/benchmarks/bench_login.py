@@ -0,0 +1,62 @@
+"""
+Password verification throughput: inline werkzeug vs backend.auth's
+process pool at several pool sizes.
+
+--threads request threads each verify --logins passwords, which is what a
+threaded Flask worker does during a login burst. Inline hashing is bound by
+the GIL; the pool scales with cores.
+
+Run from scripts/:
+    python -m backend.benchmarks.bench_login --threads 16 --logins 20
+"""
+import argparse
+import os
+import threading
+import time
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from backend import auth
+
+
+def run(threads, logins, verify, password_hash):
+    def worker():
+        for _ in range(logins):
+            assert verify(password_hash, "secret")
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return threads * logins / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=20)
+    args = parser.parse_args()
+
+    password_hash = generate_password_hash("secret")
+    cores = os.cpu_count() or 1
+
+    print(f"{'mode':<16}{'logins/s':>10}")
+    inline = run(args.threads, args.logins, check_password_hash, password_hash)
+    print(f"{'inline':<16}{inline:>10.1f}")
+
+    for workers in sorted({1, 2, 4, cores}):
+        if workers > cores:
+            continue
+        auth.shutdown()
+        auth.HASH_WORKERS = workers
+        auth._slots = threading.BoundedSemaphore(max(args.threads, workers * 4))
+        pooled = run(args.threads, args.logins, auth.verify_password, password_hash)
+        print(f"{f'pool x{workers}':<16}{pooled:>10.1f}  ({pooled / inline:.1f}x)")
+
+    auth.shutdown()
+
+
+if __name__ == "__main__":
+    main()
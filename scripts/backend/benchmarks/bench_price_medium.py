@@ -0,0 +1,68 @@
+"""
+Medium-term price forecasts: one key at a time vs the batched table.
+
+The per-key path is the original forecast_medium_term() loop: LONG_MONTHS
+xgb.predict calls on a single 6-feature row, per (district, commodity). The
+batched path builds the lag matrix for every key of recent_monthly, so
+xgb.predict runs LONG_MONTHS times in total.
+
+Needs the trained artifacts in price_predictor/models/. Run from scripts/:
+    python -m backend.benchmarks.bench_price_medium
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.price_predictor import app as pp
+
+
+def per_key_medium_term(key):
+    """The original single-key XGBoost loop."""
+    district, commodity = key
+    lags = list(pp.recent_monthly[key][-3:])
+    d_id = pp.district_enc[district]
+    c_id = pp.commodity_enc[commodity]
+
+    long_forecast = []
+    for i in range(pp.LONG_MONTHS):
+        Xg = [[lags[-1], lags[-2], lags[-3], i + 1, d_id, c_id]]
+        p = float(pp.xgb.predict(Xg)[0])
+        long_forecast.append(p)
+        lags = lags[1:] + [p]
+    return long_forecast
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=0,
+                        help="limit the per-key loop to this many keys (0 = all)")
+    args = parser.parse_args()
+
+    keys = pp._medium_term_keys(pp.recent_monthly)
+    sample = keys[:args.keys] if args.keys else keys
+    print(f"{len(keys)} keys with 3+ months of history")
+
+    # Warm up the model outside the timings
+    pp.forecast_medium_term_batch(keys[:1])
+
+    start = time.perf_counter()
+    single = np.array([per_key_medium_term(key) for key in sample])
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = pp.medium_term_table()
+    batched_s = time.perf_counter() - start
+    batched = np.array([table[key] for key in sample])
+
+    print(f"{'path':<10}{'keys':>8}{'model calls':>13}{'seconds':>10}{'keys/s':>12}")
+    print(f"{'per-key':<10}{len(sample):>8}{len(sample) * pp.LONG_MONTHS:>13}"
+          f"{single_s:>10.2f}{len(sample) / single_s:>12.1f}")
+    print(f"{'batched':<10}{len(keys):>8}{pp.LONG_MONTHS:>13}"
+          f"{batched_s:>10.2f}{len(keys) / batched_s:>12.1f}")
+    print(f"speedup {(single_s / len(sample)) / (batched_s / len(keys)):.1f}x per key, "
+          f"max abs difference {np.max(np.abs(single - batched)):.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Short-term price forecasts: one key at a time vs predict_batch().
+
+The per-key path is the original predict() loop: SHORT_DAYS lstm.predict
+calls with a batch of one, per (district, commodity). The batched path rolls
+every key forward together, so the LSTM runs SHORT_DAYS times in total.
+
+Needs the trained artifacts in price_predictor/models/. Run from scripts/:
+    python -m backend.benchmarks.bench_price_predict --keys 200
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.price_predictor import app as pp
+
+
+def per_key_short_term(key):
+    """The original single-key LSTM loop."""
+    district, commodity = key
+    prices = np.array(pp.recent_daily[key][-pp.LOOKBACK:]).reshape(-1, 1)
+    prices_scaled = pp.scaler.transform(prices)
+
+    meta = np.array([pp.district_enc[district], pp.commodity_enc[commodity], 1], dtype=np.float32)
+    meta_seq = np.repeat(meta[np.newaxis, :], pp.LOOKBACK, axis=0)
+
+    seq = prices_scaled.copy()
+    X = np.concatenate([seq, meta_seq], axis=1).reshape(1, pp.LOOKBACK, 4)
+
+    short_scaled = []
+    for _ in range(pp.SHORT_DAYS):
+        p = pp.lstm.predict(X, verbose=0)[0, 0]
+        short_scaled.append(p)
+        seq = np.vstack([seq[1:], [[p]]])
+        X = np.concatenate([seq, meta_seq], axis=1).reshape(1, pp.LOOKBACK, 4)
+
+    return pp.scaler.inverse_transform(np.array(short_scaled).reshape(-1, 1)).flatten()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=200,
+                        help="number of (district, commodity) keys to forecast")
+    args = parser.parse_args()
+
+    keys = [
+        key for key in pp.recent_daily
+        if pp._check(key) is None
+    ][:args.keys]
+    print(f"{len(keys)} keys with {pp.LOOKBACK}+ days of history")
+
+    # Warm up the model outside the timings
+    pp.forecast_short_term(keys[:1])
+
+    start = time.perf_counter()
+    single = np.array([per_key_short_term(key) for key in keys])
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = pp.forecast_short_term(keys)
+    batched_s = time.perf_counter() - start
+
+    print(f"{'path':<10}{'model calls':>12}{'seconds':>10}{'keys/s':>10}")
+    print(f"{'per-key':<10}{len(keys) * pp.SHORT_DAYS:>12}{single_s:>10.2f}{len(keys) / single_s:>10.1f}")
+    print(f"{'batched':<10}{pp.SHORT_DAYS:>12}{batched_s:>10.2f}{len(keys) / batched_s:>10.1f}")
+    print(f"speedup {single_s / batched_s:.1f}x, "
+          f"max abs difference {np.max(np.abs(single - batched)):.4f}")
+
+
+if __name__ == "__main__":
+    main()
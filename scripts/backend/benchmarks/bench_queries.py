@@ -0,0 +1,172 @@
+"""
+Scale benchmark for every SQL statement the Flask routes issue.
+
+Each statement in query_plans.HOT_QUERIES (plus the route writes below) is
+executed --iterations times with randomised parameters against a database
+populated by database/synthetic.py, and the runner reports p50/p95/p99
+latency, rows returned and SQLite VM operations per call. Python's sqlite3
+does not expose sqlite3_stmt_status, so VM operations (counted with a
+progress handler) stand in for rows scanned: a plan regression from SEARCH
+to SCAN shows up as a jump of orders of magnitude.
+
+Writes run inside a savepoint that is rolled back, so the data set is not
+modified. Exits non-zero if any hot query falls back to a full table scan.
+
+    cd scripts
+    python -m backend.database.synthetic --db /tmp/scale.db --farmers 500000 --soil-reports 2000000
+    python -m backend.benchmarks.bench_queries --db /tmp/scale.db
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from backend.database.access import GRANT_NEW_FARMER_SQL
+from backend.database.db import connect
+from backend.database.migrations import migrate
+from backend.database.queries import FARMER_SIGNUP_SQL
+from backend.database.query_plans import HOT_QUERIES, check
+from backend.database.soil_writer import INSERT_SQL as SOIL_INSERT_SQL
+from backend.districts import KARNATAKA_DISTRICTS
+
+VM_OPS_PER_TICK = 10
+
+WRITE_QUERIES = {
+    "farmer_signup_insert": FARMER_SIGNUP_SQL,
+    "soil_report_insert": SOIL_INSERT_SQL,
+    "grant_new_farmer": GRANT_NEW_FARMER_SQL,
+}
+
+
+class Sampler:
+    """Draws realistic parameters for each statement from the data set."""
+
+    def __init__(self, conn, rng):
+        self.rng = rng
+        self.max_farmer = conn.execute("SELECT COALESCE(MAX(id), 1) FROM farmers").fetchone()[0]
+        self.head_ids = [r[0] for r in conn.execute("SELECT id FROM farmer_heads")] or [1]
+        self.farmer_names = [
+            r[0] for r in conn.execute("SELECT username FROM farmers ORDER BY RANDOM() LIMIT 1000")
+        ] or ["farmer"]
+        self.head_names = [r[0] for r in conn.execute("SELECT username FROM farmer_heads")] or ["head"]
+        self.districts = list(KARNATAKA_DISTRICTS)
+        self.counter = 0
+
+    def farmer_id(self):
+        return self.rng.randint(1, self.max_farmer)
+
+    def params(self, name, default):
+        r = self.rng
+        if name == "farmer_login":
+            return (r.choice(self.farmer_names),)
+        if name == "head_login":
+            return (r.choice(self.head_names),)
+        if name == "head_access_high_water_mark":
+            return (r.choice(self.head_ids),)
+        if name == "head_access_new_farmers":
+            start = max(0, self.max_farmer - 100)
+            return (r.choice(self.head_ids), start, self.max_farmer)
+        if name in ("weather_farmer_location", "soil_report_farmer_exists",
+                    "farmer_latest_soil_report", "farmer_disease_reports"):
+            return (self.farmer_id(),)
+        if name == "head_farmer_page":
+            return (r.choice(self.head_ids), self.farmer_id(), r.choice(self.districts), 101)
+        if name == "head_farmer_page_summary":
+            return (r.choice(self.head_ids), self.farmer_id(), 101)
+        if name == "farmer_signup_insert":
+            self.counter += 1
+            district = r.choice(self.districts)
+            coords = KARNATAKA_DISTRICTS[district]
+            return (f"bench_{self.counter}_{r.random()}", "x", None, "village",
+                    district, coords["lat"], coords["lon"])
+        if name == "soil_report_insert":
+            return (self.farmer_id(), 40, 25, 60, 6.5, 27, 70, 120, 85, 90)
+        if name == "grant_new_farmer":
+            return (self.farmer_id(),)
+        return default
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def time_statement(conn, sql, params_fn, iterations, write=False):
+    latencies, rows, vm_ops = [], [], []
+    ticks = [0]
+
+    def tick():
+        ticks[0] += 1
+        return 0
+
+    conn.set_progress_handler(tick, VM_OPS_PER_TICK)
+    try:
+        for _ in range(iterations):
+            params = params_fn()
+            ticks[0] = 0
+            if write:
+                conn.execute("SAVEPOINT bench")
+            start = time.perf_counter()
+            cursor = conn.execute(sql, params)
+            fetched = cursor.fetchall()
+            elapsed = (time.perf_counter() - start) * 1000
+            if write:
+                conn.execute("ROLLBACK TO bench")
+                conn.execute("RELEASE bench")
+            latencies.append(elapsed)
+            rows.append(len(fetched) if not write else cursor.rowcount)
+            vm_ops.append(ticks[0] * VM_OPS_PER_TICK)
+    finally:
+        conn.set_progress_handler(None, 0)
+
+    latencies.sort()
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "rows": statistics.mean(rows),
+        "vm_ops": statistics.mean(vm_ops),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every route SQL statement")
+    parser.add_argument("--db", required=True, help="database populated by database/synthetic.py")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    migrate(conn)
+    sampler = Sampler(conn, random.Random(args.seed))
+
+    print(f"{'statement':<30}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'rows':>9}{'vm ops':>12}")
+    statements = [
+        (name, sql, default, sql.lstrip().upper().startswith("INSERT"))
+        for name, (sql, default) in HOT_QUERIES.items()
+    ]
+    statements += [(name, sql, (), True) for name, sql in WRITE_QUERIES.items()]
+
+    for name, sql, default, write in statements:
+        result = time_statement(
+            conn, sql,
+            lambda: sampler.params(name, default),
+            args.iterations,
+            write=write,
+        )
+        print(f"{name:<30}{result['p50']:>9.3f}{result['p95']:>9.3f}{result['p99']:>9.3f}"
+              f"{result['rows']:>9.1f}{result['vm_ops']:>12.0f}")
+
+    failures = check(conn)
+    conn.close()
+
+    for name, (plan, scans) in failures.items():
+        print(f"❌ {name} scans {', '.join(scans)}: {' | '.join(plan)}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Farmer access grants for farmer heads.
+
+Every active head can see every active farmer. Instead of re-inserting one
+row per farmer on each head login, grants are applied set-wise:
+
+- `sync_head_access` runs a single INSERT ... SELECT over the farmers created
+  since the head's high-water mark (head_access_sync.last_farmer_id), so a
+  repeat login touches only new farmers.
+- `grant_new_farmer` is called from farmer signup and grants the new farmer
+  to every active head in one statement, advancing those heads' marks.
+
+Reactivating a head or a farmer is handled by triggers (migration 7): the
+head's mark is reset, or the farmer is granted to every active head.
+
+Callers own the transaction (pass the connection from `get_db()`).
+"""
+
+GRANT_COLUMNS = "head_id, farmer_id, can_view_soil, can_view_crops, can_view_disease"
+
+HIGH_WATER_MARK_SQL = "SELECT last_farmer_id FROM head_access_sync WHERE head_id = ?"
+
+# "+is_active" keeps the planner on the rowid range instead of walking
+# every active farmer through idx_farmers_active_district
+SYNC_GRANTS_SQL = f"""
+    INSERT OR IGNORE INTO farmer_access ({GRANT_COLUMNS})
+    SELECT ?, id, 1, 1, 1
+    FROM farmers
+    WHERE +is_active = 1 AND id > ? AND id <= ?
+"""
+
+GRANT_NEW_FARMER_SQL = f"""
+    INSERT OR IGNORE INTO farmer_access ({GRANT_COLUMNS})
+    SELECT id, ?, 1, 1, 1
+    FROM farmer_heads
+    WHERE is_active = 1
+"""
+
+
+def get_high_water_mark(conn, head_id):
+    row = conn.execute(HIGH_WATER_MARK_SQL, (head_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def _set_high_water_mark(conn, head_id, farmer_id):
+    conn.execute("""
+        INSERT INTO head_access_sync (head_id, last_farmer_id, synced_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(head_id) DO UPDATE SET
+            last_farmer_id = excluded.last_farmer_id,
+            synced_at = excluded.synced_at
+    """, (head_id, farmer_id))
+
+
+def sync_head_access(conn, head_id):
+    """
+    Grant `head_id` access to every active farmer created since its last
+    sync. Returns the number of new grants.
+    """
+    last_farmer_id = get_high_water_mark(conn, head_id)
+    max_farmer_id = conn.execute("SELECT MAX(id) FROM farmers").fetchone()[0] or 0
+
+    if max_farmer_id <= last_farmer_id:
+        return 0
+
+    cursor = conn.execute(SYNC_GRANTS_SQL, (head_id, last_farmer_id, max_farmer_id))
+
+    _set_high_water_mark(conn, head_id, max_farmer_id)
+    return cursor.rowcount
+
+
+def grant_new_farmer(conn, farmer_id):
+    """
+    Grant a newly created farmer to every active head. Active heads that
+    were fully synced up to the previous farmer move their mark forward, so
+    their next login has nothing left to do. Inactive heads keep their mark
+    and pick the farmer up when they sync after reactivation.
+    """
+    cursor = conn.execute(GRANT_NEW_FARMER_SQL, (farmer_id,))
+
+    conn.execute("""
+        UPDATE head_access_sync
+        SET last_farmer_id = ?, synced_at = CURRENT_TIMESTAMP
+        WHERE last_farmer_id = (
+            SELECT COALESCE(MAX(id), 0) FROM farmers WHERE id < ?
+        )
+        AND head_id IN (SELECT id FROM farmer_heads WHERE is_active = 1)
+    """, (farmer_id, farmer_id))
+
+    return cursor.rowcount
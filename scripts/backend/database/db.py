@@ -1,9 +1,139 @@
 import sqlite3
 import os
+import queue
+import threading
+from contextlib import contextmanager
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "agriculture.db")
 
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
+# Pragmas applied once per pooled connection.
+# WAL lets dashboard reads proceed while soil reports are being written,
+# and NORMAL sync is durable in WAL mode except on power loss.
+BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", 5000))
+CACHE_SIZE_KB = int(os.environ.get("DB_CACHE_SIZE_KB", 64 * 1024))
+MMAP_SIZE = int(os.environ.get("DB_MMAP_SIZE", 256 * 1024 * 1024))
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA cache_size = -{CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size = {MMAP_SIZE}",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA foreign_keys = ON",
+)
+
+# Bounded pool of idle connections per worker. Gunicorn workers fork after
+# import, so the pool is keyed by pid (and path) and never shared across
+# processes. Connections beyond POOL_SIZE are closed when released.
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 8))
+
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+_pool_key = None
+_pool_lock = threading.Lock()
+
+# The connection a thread currently holds, and how deeply get_db is nested
+_local = threading.local()
+
+
+def connect(path=None):
+    """Open a new tuned connection (not pooled)."""
+    # Pooled connections move between threads, one borrower at a time
+    conn = sqlite3.connect(path or DB_PATH, timeout=BUSY_TIMEOUT_MS / 1000,
+                           check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
     return conn
+
+
+def _current_pool():
+    """The idle-connection pool for this process and DB_PATH."""
+    global _pool, _pool_key
+    key = (os.getpid(), DB_PATH)
+    with _pool_lock:
+        if _pool_key != key:
+            # Forked or repointed: handles from the old pool are not ours
+            _pool = queue.LifoQueue(maxsize=POOL_SIZE)
+            _pool_key = key
+        return _pool
+
+
+def acquire_connection():
+    """Take an idle pooled connection, or open one when none is free."""
+    pool = _current_pool()
+    try:
+        return pool.get_nowait()
+    except queue.Empty:
+        return connect()
+
+
+def release_connection(conn):
+    """Return a connection to the pool (closing it if the pool is full)."""
+    if conn.in_transaction:
+        conn.rollback()
+    pool = _current_pool()
+    try:
+        pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+def close_connection(exc=None):
+    """
+    Release whatever the current thread still holds. Registered as a Flask
+    teardown so a request can never keep a connection out of the pool.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.conn = None
+        _local.depth = 0
+        if _local.pid == os.getpid():
+            release_connection(conn)
+
+
+@contextmanager
+def get_db():
+    """
+    Borrow a pooled connection for the duration of the block.
+
+    Commits on success and rolls back on any exception, so routes never
+    leave a half-finished transaction (or an open handle) behind:
+
+        with get_db() as conn:
+            conn.execute(...)
+
+    Nested blocks on the same thread share the connection; they run in a
+    savepoint, so only the outermost block commits.
+    """
+    depth = getattr(_local, "depth", 0)
+    if depth and getattr(_local, "pid", None) == os.getpid():
+        conn = _local.conn
+        savepoint = f"get_db_{depth}"
+        if not conn.in_transaction:
+            # A savepoint outside a transaction would commit on RELEASE
+            conn.execute("BEGIN")
+        conn.execute(f"SAVEPOINT {savepoint}")
+        _local.depth = depth + 1
+        try:
+            yield conn
+            conn.execute(f"RELEASE {savepoint}")
+        except Exception:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+            raise
+        finally:
+            _local.depth = depth
+        return
+
+    conn = acquire_connection()
+    _local.conn, _local.pid, _local.depth = conn, os.getpid(), 1
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        _local.conn, _local.depth = None, 0
+        release_connection(conn)
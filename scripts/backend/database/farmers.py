@@ -0,0 +1,130 @@
+"""
+Farmer listing queries for the head dashboard.
+
+Pages are keyset-paginated on farmer id: the cursor is the last id of the
+previous page, so every page is an index range scan on
+farmer_access(head_id, farmer_id) regardless of how deep the client pages.
+"""
+import json
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Latest soil report and disease report count for the farmers on one page,
+# computed in the same statement instead of one lookup per farmer.
+SUMMARY_SQL = """
+, latest_soil AS (
+    SELECT
+        farmer_id,
+        soil_health_score,
+        created_at,
+        ROW_NUMBER() OVER (
+            PARTITION BY farmer_id
+            ORDER BY created_at DESC, id DESC
+        ) AS rn
+    FROM soil_reports
+    WHERE farmer_id IN (SELECT id FROM page)
+),
+disease_counts AS (
+    SELECT farmer_id, COUNT(*) AS report_count
+    FROM disease_reports
+    WHERE farmer_id IN (SELECT id FROM page)
+    GROUP BY farmer_id
+)
+SELECT
+    p.*,
+    ls.soil_health_score AS latest_soil_health_score,
+    ls.created_at AS latest_soil_report_at,
+    COALESCE(dc.report_count, 0) AS disease_report_count
+FROM page p
+LEFT JOIN latest_soil ls ON ls.farmer_id = p.id AND ls.rn = 1
+LEFT JOIN disease_counts dc ON dc.farmer_id = p.id
+ORDER BY p.id
+"""
+
+
+def list_head_farmers(conn, head_id, cursor=0, limit=DEFAULT_PAGE_SIZE,
+                      district=None, village=None, with_summary=False):
+    """
+    Return (farmers, next_cursor) for one page of the farmers visible to
+    `head_id`. `next_cursor` is None on the last page.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+    params = [head_id, cursor or 0]
+    if district:
+        params.append(district)
+    if village:
+        params.append(village)
+
+    # One extra row tells us whether another page exists
+    params.append(limit + 1)
+
+    sql = page_sql(bool(district), bool(village), with_summary)
+    farmers = [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+    next_cursor = None
+    if len(farmers) > limit:
+        farmers = farmers[:limit]
+        next_cursor = farmers[-1]["id"]
+
+    return farmers, next_cursor
+
+
+def page_sql(district=False, village=False, with_summary=False):
+    """
+    SQL for one page of list_head_farmers(); parameters are head_id, cursor,
+    then district / village when filtered, then the row limit.
+    """
+    filters = ["fa.head_id = ?", "fa.farmer_id > ?"]
+    if district:
+        filters.append("f.district = ?")
+    if village:
+        filters.append("f.village = ?")
+
+    sql = f"""
+        WITH page AS (
+            SELECT
+                f.id,
+                f.full_name,
+                f.village,
+                f.district
+            FROM farmer_access fa
+            JOIN farmers f ON fa.farmer_id = f.id
+            WHERE {" AND ".join(filters)}
+            ORDER BY fa.farmer_id
+            LIMIT ?
+        )
+    """
+    return sql + (SUMMARY_SQL if with_summary else "SELECT * FROM page ORDER BY id")
+
+
+# Farmers' coordinates for batch weather, in one statement either way
+HEAD_LOCATIONS_SQL = """
+    SELECT f.id, f.district, f.latitude, f.longitude
+    FROM farmer_access fa
+    JOIN farmers f ON fa.farmer_id = f.id
+    WHERE fa.head_id = ? AND f.is_active = 1
+    ORDER BY fa.farmer_id
+"""
+
+IDS_LOCATIONS_SQL = """
+    SELECT id, district, latitude, longitude
+    FROM farmers
+    WHERE id IN (SELECT value FROM json_each(?)) AND +is_active = 1
+    ORDER BY id
+"""
+
+
+def farmer_locations(conn, head_id=None, farmer_ids=None):
+    """
+    Return [(farmer_id, district, latitude, longitude)] for every active
+    farmer visible to `head_id`, or for the given `farmer_ids`.
+    """
+    if head_id is not None:
+        rows = conn.execute(HEAD_LOCATIONS_SQL, (head_id,))
+    else:
+        # json_each keeps any number of ids to one bound parameter;
+        # +is_active keeps the planner on rowid lookups for the listed ids
+        rows = conn.execute(IDS_LOCATIONS_SQL, (json.dumps([int(i) for i in farmer_ids]),))
+    return [tuple(row) for row in rows]
@@ -0,0 +1,297 @@
+"""
+Bulk farmer import from CSV or JSONL.
+
+Rows are streamed (the file is never loaded whole), validated against
+KARNATAKA_DISTRICTS, password-hashed in parallel across processes and
+inserted with executemany, one transaction per batch. Each transaction also
+advances the import_checkpoints row for the file, so re-running the same
+command after a crash resumes right after the last committed batch.
+
+Rejected rows are appended to <input>.errors.csv with their line number.
+A batch that hits a constraint (a username inserted concurrently) is
+retried row by row, so only the clashing rows are rejected.
+New farmers are granted to heads on the heads' next login
+(database/access.py), not row by row here.
+
+    cd scripts
+    python -m backend.database.import_farmers farmers.csv --workers 8
+
+Columns: username, password, village, district (required);
+full_name, phone, email (optional).
+
+Throughput is bound by the password hash: werkzeug's default is
+deliberately slow, so --workers should match the available cores.
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import time
+from functools import partial
+from multiprocessing import Pool
+
+from werkzeug.security import generate_password_hash
+
+from backend.database.db import DB_PATH, connect
+from backend.database.migrations import migrate
+from backend.districts import KARNATAKA_DISTRICTS
+
+REQUIRED = ("username", "password", "village", "district")
+
+INSERT_SQL = """
+    INSERT INTO farmers (
+        username, password_hash,
+        full_name, phone, email,
+        village, district,
+        latitude, longitude
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Accept "mandya" or " MANDYA " for "Mandya"
+_DISTRICTS = {name.lower(): name for name in KARNATAKA_DISTRICTS}
+
+
+def read_records(path, fmt=None):
+    """Yield (line_number, record dict) from a CSV or JSONL file."""
+    fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    record = {"__error__": f"Invalid JSON: {e}"}
+                if not isinstance(record, dict):
+                    record = {"__error__": "Expected a JSON object"}
+                yield line_number, record
+
+
+def validate(record):
+    """Return (clean record, None) or (None, error message)."""
+    if "__error__" in record:
+        return None, record["__error__"]
+
+    missing = [f for f in REQUIRED if not str(record.get(f) or "").strip()]
+    if missing:
+        return None, f"Missing fields: {', '.join(missing)}"
+
+    district = _DISTRICTS.get(str(record["district"]).strip().lower())
+    if not district:
+        return None, f"Invalid district: {record['district']}"
+
+    return {
+        "username": str(record["username"]).strip(),
+        "password": str(record["password"]),
+        "full_name": record.get("full_name") or None,
+        "phone": record.get("phone") or None,
+        "email": record.get("email") or None,
+        "village": str(record["village"]).strip(),
+        "district": district,
+    }, None
+
+
+def _batches(records, size):
+    batch = []
+    for item in records:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ImportReport:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def add(self, line_number, username, error):
+        if self._writer is None:
+            new = not os.path.exists(self.path)
+            self._file = open(self.path, "a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            if new:
+                self._writer.writerow(["line", "username", "error"])
+        self._writer.writerow([line_number, username, error])
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+def _save_checkpoint(conn, source, position, inserted, failed):
+    conn.execute("""
+        INSERT INTO import_checkpoints (source, position, inserted, failed)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(source) DO UPDATE SET
+            position = excluded.position,
+            inserted = inserted + excluded.inserted,
+            failed = failed + excluded.failed,
+            updated_at = CURRENT_TIMESTAMP
+    """, (source, position, inserted, failed))
+
+
+def _commit_batch(conn, source, position, rows, failed):
+    """Insert `rows` and advance the checkpoint in one transaction."""
+    with conn:
+        conn.executemany(INSERT_SQL, rows)
+        _save_checkpoint(conn, source, position, len(rows), failed)
+
+
+def _commit_rows(conn, source, position, rows, failed):
+    """
+    Fallback for a batch that hit a constraint: insert [(line, row)] one at
+    a time in a single transaction. Returns (inserted rows, row errors).
+    """
+    inserted, errors = [], []
+    with conn:
+        for line_number, row in rows:
+            try:
+                conn.execute(INSERT_SQL, row)
+            except sqlite3.IntegrityError as e:
+                errors.append((line_number, row[0], f"Rejected by database: {e}"))
+            else:
+                inserted.append((line_number, row))
+        _save_checkpoint(conn, source, position, len(inserted), failed + len(errors))
+    return inserted, errors
+
+
+def import_farmers(conn, path, pool, hash_fn, batch_size=5000, fmt=None, report=None):
+    """
+    Import `path` into `conn`, resuming from its checkpoint.
+    Returns (inserted, failed, skipped) for this run, where `skipped` counts
+    the records already processed by an earlier run.
+    """
+    source = os.path.abspath(path)
+    row = conn.execute(
+        "SELECT position FROM import_checkpoints WHERE source = ?", (source,)
+    ).fetchone()
+    resume_after = row[0] if row else 0
+
+    inserted = failed = skipped = 0
+
+    def remaining():
+        nonlocal skipped
+        for line, record in read_records(path, fmt):
+            if line <= resume_after:
+                skipped += 1
+                continue
+            yield line, record
+
+    records = remaining()
+
+    for batch in _batches(records, batch_size):
+        valid, errors = [], []
+        seen = set()
+        for line_number, record in batch:
+            clean, error = validate(record)
+            if clean and clean["username"] in seen:
+                clean, error = None, "Duplicate username in file"
+            if error:
+                errors.append((line_number, record.get("username"), error))
+                continue
+            seen.add(clean["username"])
+            valid.append((line_number, clean))
+
+        # Usernames that already exist (unique index lookup, one query per batch)
+        if valid:
+            placeholders = ",".join("?" for _ in valid)
+            existing = {
+                r[0] for r in conn.execute(
+                    f"SELECT username FROM farmers WHERE username IN ({placeholders})",
+                    [c["username"] for _, c in valid]
+                )
+            }
+            if existing:
+                errors += [
+                    (line, c["username"], "Username already exists")
+                    for line, c in valid if c["username"] in existing
+                ]
+                valid = [(line, c) for line, c in valid if c["username"] not in existing]
+
+        hashes = pool.map(hash_fn, [c["password"] for _, c in valid], chunksize=64) if valid else []
+
+        rows = []
+        for (line_number, c), password_hash in zip(valid, hashes):
+            coords = KARNATAKA_DISTRICTS[c["district"]]
+            rows.append((line_number, (
+                c["username"], password_hash,
+                c["full_name"], c["phone"], c["email"],
+                c["village"], c["district"],
+                coords["lat"], coords["lon"],
+            )))
+
+        last_line = batch[-1][0]
+        try:
+            _commit_batch(conn, source, last_line, [r for _, r in rows], len(errors))
+        except sqlite3.IntegrityError:
+            # Someone else inserted one of these usernames since the lookup
+            # above; insert row by row so only the clashing rows are rejected
+            rows, clashes = _commit_rows(conn, source, last_line, rows, len(errors))
+            errors += clashes
+
+        if report:
+            for line_number, username, error in sorted(errors):
+                report.add(line_number, username, error)
+
+        inserted += len(rows)
+        failed += len(errors)
+        print(f"   … line {last_line}: {inserted} inserted, {failed} rejected")
+
+    return inserted, failed, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import farmers from CSV/JSONL")
+    parser.add_argument("path")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--hash-method", default=None,
+                        help="werkzeug hash method (default: werkzeug's default)")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore the saved checkpoint and start from the top")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    migrate(conn)
+    if args.restart:
+        with conn:
+            conn.execute("DELETE FROM import_checkpoints WHERE source = ?",
+                         (os.path.abspath(args.path),))
+
+    hash_fn = partial(generate_password_hash, method=args.hash_method) \
+        if args.hash_method else generate_password_hash
+    report = ImportReport(args.path + ".errors.csv")
+
+    start = time.perf_counter()
+    with Pool(processes=args.workers) as pool:
+        inserted, failed, skipped = import_farmers(
+            conn, args.path, pool, hash_fn,
+            batch_size=args.batch_size, fmt=args.format, report=report
+        )
+    elapsed = time.perf_counter() - start
+    report.close()
+    conn.close()
+
+    if skipped:
+        print(f"↪️  Resumed from the checkpoint, skipped {skipped} rows already processed")
+    print(f"✅ Imported {inserted} farmers in {elapsed:.1f}s "
+          f"({inserted / elapsed if elapsed else 0:.0f} rows/s), {failed} rejected")
+    if failed:
+        print(f"   Rejected rows: {report.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""
+Numbered schema migrations.
+
+Each migration runs once, inside a transaction, and is recorded in the
+schema_migrations table. `migrate()` is called on app startup and by
+init_db.py, so an existing database is upgraded in place and a fresh one
+is built from scratch by the same code path.
+
+To change the schema, append a new (version, name, statements) entry to
+MIGRATIONS. Never edit a migration that has already shipped.
+"""
+import sqlite3
+
+# Recomputes every soil rollup table from soil_reports. Shared by migration 4
+# (initial backfill) and rollups.rebuild().
+SOIL_ROLLUP_REBUILD = [
+    "DELETE FROM soil_rollup_farmer",
+    "DELETE FROM soil_rollup_district",
+    "DELETE FROM soil_rollup_district_daily",
+    """
+    INSERT INTO soil_rollup_farmer
+    SELECT
+        s.farmer_id, f.district, COUNT(*), SUM(COALESCE(s.soil_health_score, 0)),
+        SUM(s.nitrogen < 50), SUM(s.phosphorus < 30), SUM(s.potassium < 30),
+        MAX(s.created_at)
+    FROM soil_reports s
+    LEFT JOIN farmers f ON f.id = s.farmer_id
+    GROUP BY s.farmer_id
+    """,
+    """
+    INSERT INTO soil_rollup_district
+    SELECT
+        district, SUM(report_count), SUM(score_sum),
+        SUM(nitrogen_low), SUM(phosphorus_low), SUM(potassium_low),
+        MAX(last_report_at)
+    FROM soil_rollup_farmer
+    WHERE district IS NOT NULL
+    GROUP BY district
+    """,
+    """
+    INSERT INTO soil_rollup_district_daily
+    SELECT
+        f.district, DATE(s.created_at), COUNT(*), SUM(COALESCE(s.soil_health_score, 0)),
+        SUM(s.nitrogen < 50), SUM(s.phosphorus < 30), SUM(s.potassium < 30)
+    FROM soil_reports s
+    JOIN farmers f ON f.id = s.farmer_id
+    GROUP BY f.district, DATE(s.created_at)
+    """,
+]
+
+MIGRATIONS = [
+    (1, "base schema", [
+        """
+        CREATE TABLE IF NOT EXISTS farmers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+
+            full_name TEXT,
+            phone TEXT,
+            email TEXT,
+
+            village TEXT NOT NULL,
+            district TEXT NOT NULL,
+            state TEXT DEFAULT 'Karnataka',
+
+            latitude REAL,
+            longitude REAL,
+
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            last_login DATETIME,
+            is_active INTEGER DEFAULT 1
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS farmer_crops (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            farmer_id INTEGER NOT NULL,
+
+            crop_name TEXT NOT NULL,
+            season TEXT,
+            area_acres REAL,
+
+            sowing_date DATE,
+            expected_harvest DATE,
+
+            is_active INTEGER DEFAULT 1,
+
+            FOREIGN KEY (farmer_id) REFERENCES farmers(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS soil_reports (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            farmer_id INTEGER NOT NULL,
+
+            nitrogen REAL NOT NULL,
+            phosphorus REAL NOT NULL,
+            potassium REAL NOT NULL,
+
+            ph REAL,
+            temperature REAL,
+            humidity REAL,
+            rainfall REAL,
+
+            soil_health_score INTEGER,
+            confidence_percentage INTEGER,
+
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (farmer_id) REFERENCES farmers(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS disease_reports (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            farmer_id INTEGER NOT NULL,
+
+            crop_name TEXT,
+            disease_name TEXT,
+            severity TEXT,
+
+            image_path TEXT,
+            ai_advice TEXT,
+
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (farmer_id) REFERENCES farmers(id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS farmer_heads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+
+            full_name TEXT,
+            role TEXT DEFAULT 'head',
+
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            last_login DATETIME,
+            is_active INTEGER DEFAULT 1
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS farmer_access (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            head_id INTEGER NOT NULL,
+            farmer_id INTEGER NOT NULL,
+
+            can_view_soil INTEGER DEFAULT 1,
+            can_view_crops INTEGER DEFAULT 1,
+            can_view_disease INTEGER DEFAULT 1,
+
+            granted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+            UNIQUE(head_id, farmer_id),
+
+            FOREIGN KEY (head_id) REFERENCES farmer_heads(id),
+            FOREIGN KEY (farmer_id) REFERENCES farmers(id)
+        )
+        """,
+    ]),
+    # farmer_access(head_id, farmer_id) is already covered by the index
+    # SQLite builds for its UNIQUE constraint, so it is not duplicated here.
+    (2, "indexes for hot queries", [
+        "CREATE INDEX IF NOT EXISTS idx_farmers_active_district ON farmers(is_active, district)",
+        "CREATE INDEX IF NOT EXISTS idx_farmer_access_farmer ON farmer_access(farmer_id)",
+        "CREATE INDEX IF NOT EXISTS idx_soil_reports_farmer_created ON soil_reports(farmer_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_disease_reports_farmer_created ON disease_reports(farmer_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_farmer_crops_farmer ON farmer_crops(farmer_id, is_active)",
+    ]),
+    # High-water mark of the last farmer id granted to each head, so login
+    # only has to consider farmers created since the previous sync.
+    (3, "head access sync state", [
+        """
+        CREATE TABLE IF NOT EXISTS head_access_sync (
+            head_id INTEGER PRIMARY KEY,
+            last_farmer_id INTEGER NOT NULL DEFAULT 0,
+            synced_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (head_id) REFERENCES farmer_heads(id)
+        )
+        """,
+    ]),
+    # Soil report aggregates kept current by triggers on every insert
+    # (including the batched inserts from soil_writer). rollups.rebuild()
+    # recomputes them from scratch for backfills.
+    (4, "soil report rollups", [
+        """
+        CREATE TABLE IF NOT EXISTS soil_rollup_farmer (
+            farmer_id INTEGER PRIMARY KEY,
+            district TEXT,
+            report_count INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            nitrogen_low INTEGER NOT NULL DEFAULT 0,
+            phosphorus_low INTEGER NOT NULL DEFAULT 0,
+            potassium_low INTEGER NOT NULL DEFAULT 0,
+            last_report_at DATETIME
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS soil_rollup_district (
+            district TEXT PRIMARY KEY,
+            report_count INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            nitrogen_low INTEGER NOT NULL DEFAULT 0,
+            phosphorus_low INTEGER NOT NULL DEFAULT 0,
+            potassium_low INTEGER NOT NULL DEFAULT 0,
+            last_report_at DATETIME
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS soil_rollup_district_daily (
+            district TEXT NOT NULL,
+            day DATE NOT NULL,
+            report_count INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            nitrogen_low INTEGER NOT NULL DEFAULT 0,
+            phosphorus_low INTEGER NOT NULL DEFAULT 0,
+            potassium_low INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (district, day)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_soil_reports_rollup
+        AFTER INSERT ON soil_reports
+        BEGIN
+            INSERT INTO soil_rollup_farmer (
+                farmer_id, district, report_count, score_sum,
+                nitrogen_low, phosphorus_low, potassium_low, last_report_at
+            )
+            VALUES (
+                NEW.farmer_id,
+                (SELECT district FROM farmers WHERE id = NEW.farmer_id),
+                1,
+                COALESCE(NEW.soil_health_score, 0),
+                NEW.nitrogen < 50, NEW.phosphorus < 30, NEW.potassium < 30,
+                NEW.created_at
+            )
+            ON CONFLICT(farmer_id) DO UPDATE SET
+                report_count = report_count + 1,
+                score_sum = score_sum + excluded.score_sum,
+                nitrogen_low = nitrogen_low + excluded.nitrogen_low,
+                phosphorus_low = phosphorus_low + excluded.phosphorus_low,
+                potassium_low = potassium_low + excluded.potassium_low,
+                last_report_at = MAX(COALESCE(last_report_at, ''), excluded.last_report_at);
+
+            INSERT INTO soil_rollup_district (
+                district, report_count, score_sum,
+                nitrogen_low, phosphorus_low, potassium_low, last_report_at
+            )
+            SELECT
+                district, 1, COALESCE(NEW.soil_health_score, 0),
+                NEW.nitrogen < 50, NEW.phosphorus < 30, NEW.potassium < 30,
+                NEW.created_at
+            FROM farmers
+            WHERE id = NEW.farmer_id
+            ON CONFLICT(district) DO UPDATE SET
+                report_count = report_count + 1,
+                score_sum = score_sum + excluded.score_sum,
+                nitrogen_low = nitrogen_low + excluded.nitrogen_low,
+                phosphorus_low = phosphorus_low + excluded.phosphorus_low,
+                potassium_low = potassium_low + excluded.potassium_low,
+                last_report_at = MAX(COALESCE(last_report_at, ''), excluded.last_report_at);
+
+            INSERT INTO soil_rollup_district_daily (
+                district, day, report_count, score_sum,
+                nitrogen_low, phosphorus_low, potassium_low
+            )
+            SELECT
+                district, DATE(NEW.created_at), 1, COALESCE(NEW.soil_health_score, 0),
+                NEW.nitrogen < 50, NEW.phosphorus < 30, NEW.potassium < 30
+            FROM farmers
+            WHERE id = NEW.farmer_id
+            ON CONFLICT(district, day) DO UPDATE SET
+                report_count = report_count + 1,
+                score_sum = score_sum + excluded.score_sum,
+                nitrogen_low = nitrogen_low + excluded.nitrogen_low,
+                phosphorus_low = phosphorus_low + excluded.phosphorus_low,
+                potassium_low = potassium_low + excluded.potassium_low;
+        END
+        """,
+        # Existing reports are folded in once when the migration is applied
+        *SOIL_ROLLUP_REBUILD,
+    ]),
+    # Resume position of bulk imports (import_farmers.py), committed in the
+    # same transaction as each batch of rows.
+    (5, "import checkpoints", [
+        """
+        CREATE TABLE IF NOT EXISTS import_checkpoints (
+            source TEXT PRIMARY KEY,
+            position INTEGER NOT NULL DEFAULT 0,
+            inserted INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    # Precomputed price forecasts (price_predictor/precompute.py), one row
+    # per (district, commodity), stamped with the artifacts they came from.
+    (6, "price forecast store", [
+        """
+        CREATE TABLE IF NOT EXISTS price_forecasts (
+            district TEXT NOT NULL,
+            commodity TEXT NOT NULL,
+            data_version TEXT NOT NULL,
+            result TEXT NOT NULL,
+            computed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (district, commodity)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS price_forecast_runs (
+            data_version TEXT PRIMARY KEY,
+            keys INTEGER NOT NULL,
+            failed INTEGER NOT NULL,
+            seconds REAL NOT NULL,
+            computed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    # Head access marks only cover farmers that were active when a head
+    # synced. A reactivated head starts over from mark 0 on its next login,
+    # and a reactivated farmer is granted to every active head right away.
+    # Marks moved past inactive heads by older code are reset once.
+    (7, "head access on reactivation", [
+        "DELETE FROM head_access_sync",
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_farmer_heads_reactivated
+        AFTER UPDATE OF is_active ON farmer_heads
+        WHEN NEW.is_active = 1 AND COALESCE(OLD.is_active, 0) != 1
+        BEGIN
+            DELETE FROM head_access_sync WHERE head_id = NEW.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_farmers_reactivated
+        AFTER UPDATE OF is_active ON farmers
+        WHEN NEW.is_active = 1 AND COALESCE(OLD.is_active, 0) != 1
+        BEGIN
+            INSERT OR IGNORE INTO farmer_access (
+                head_id, farmer_id, can_view_soil, can_view_crops, can_view_disease
+            )
+            SELECT id, NEW.id, 1, 1, 1
+            FROM farmer_heads
+            WHERE is_active = 1;
+        END
+        """,
+    ]),
+]
+
+
+def current_version(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn):
+    """
+    Apply every pending migration in order. Safe to call on every startup;
+    returns the list of versions that were applied by this call.
+    """
+    applied = []
+    version = current_version(conn)
+    conn.commit()
+
+    for number, name, statements in MIGRATIONS:
+        if number <= version:
+            continue
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Another worker may have migrated while we waited for the lock
+            if current_version(conn) >= number:
+                conn.rollback()
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                (number, name)
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        applied.append(number)
+
+    return applied
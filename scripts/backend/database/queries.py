@@ -0,0 +1,37 @@
+"""
+SQL issued directly by the routes in app.py.
+
+query_plans.py imports the same constants, so the plan check always runs
+the statements the routes actually execute.
+"""
+
+FARMER_SIGNUP_SQL = """
+    INSERT INTO farmers (
+        username, password_hash,
+        full_name, village, district,
+        latitude, longitude
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+FARMER_LOGIN_SQL = """
+    SELECT id, username, password_hash, village, district,
+           latitude, longitude
+    FROM farmers
+    WHERE username = ? AND is_active = 1
+"""
+
+HEAD_LOGIN_SQL = """
+    SELECT id, username, password_hash, full_name, role
+    FROM farmer_heads
+    WHERE username = ? AND is_active = 1
+"""
+
+# Soil reports reference farmers(id); checked before a report is queued
+FARMER_EXISTS_SQL = "SELECT 1 FROM farmers WHERE id = ?"
+
+FARMER_LOCATION_SQL = """
+    SELECT latitude, longitude, district
+    FROM farmers
+    WHERE id = ? AND is_active = 1
+"""
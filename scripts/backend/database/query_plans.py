@@ -0,0 +1,98 @@
+"""
+EXPLAIN QUERY PLAN check for the hot queries issued by app.py.
+
+Every statement in HOT_QUERIES must reach its rows through an index
+(SEARCH ... USING INDEX / PRIMARY KEY). A plain "SCAN <table>" means a
+full table scan and fails the check. Run against a fresh schema:
+
+    python -m backend.database.query_plans
+"""
+import re
+import sqlite3
+import sys
+
+from backend.database.migrations import migrate
+from backend.database.access import HIGH_WATER_MARK_SQL, SYNC_GRANTS_SQL
+from backend.database.farmers import HEAD_LOCATIONS_SQL, IDS_LOCATIONS_SQL, page_sql
+from backend.database.queries import (
+    FARMER_LOGIN_SQL, HEAD_LOGIN_SQL, FARMER_LOCATION_SQL, FARMER_EXISTS_SQL
+)
+from backend.price_predictor.store import GET_FORECAST_SQL
+
+# name -> (sql, sample params); the SQL constants are the ones the code runs
+HOT_QUERIES = {
+    "farmer_login": (FARMER_LOGIN_SQL, ("farmer",)),
+    "head_login": (HEAD_LOGIN_SQL, ("head",)),
+    "head_access_high_water_mark": (HIGH_WATER_MARK_SQL, (1,)),
+    "head_access_new_farmers": (SYNC_GRANTS_SQL, (1, 0, 100)),
+    "weather_farmer_location": (FARMER_LOCATION_SQL, (1,)),
+    "soil_report_farmer_exists": (FARMER_EXISTS_SQL, (1,)),
+    "head_farmer_page": (page_sql(district=True), (1, 0, "Mandya", 101)),
+    "head_farmer_page_summary": (page_sql(with_summary=True), (1, 0, 101)),
+    "head_farmer_locations": (HEAD_LOCATIONS_SQL, (1,)),
+    "farmer_ids_locations": (IDS_LOCATIONS_SQL, ("[1, 2, 3]",)),
+    "price_forecast_lookup": (GET_FORECAST_SQL, ("Kolar", "Tomato", "0")),
+    # Index checks for the per-farmer lookups inside the page summary
+    "farmer_latest_soil_report": (
+        """
+        SELECT *
+        FROM soil_reports
+        WHERE farmer_id = ?
+        ORDER BY created_at DESC
+        LIMIT 1
+        """, (1,)),
+    "farmer_disease_reports": (
+        """
+        SELECT COUNT(*)
+        FROM disease_reports
+        WHERE farmer_id = ?
+        """, (1,)),
+}
+
+_FULL_SCAN = re.compile(r"^SCAN (\w+)(?! USING)")
+
+
+def explain(conn, sql, params=()):
+    """Return the detail column of EXPLAIN QUERY PLAN for one statement."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def full_scans(plan, tables):
+    """
+    Tables that the plan reads with a full table scan. Scans of CTEs and
+    subqueries (e.g. "SCAN page") are bounded by their own plan and ignored.
+    """
+    scans = []
+    for detail in plan:
+        match = _FULL_SCAN.match(detail)
+        if match and match.group(1) in tables:
+            scans.append(match.group(1))
+    return scans
+
+
+def check(conn, queries=None):
+    """Return {name: (plan, full_scans)} for every query that does not use an index."""
+    tables = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    failures = {}
+    for name, (sql, params) in (queries or HOT_QUERIES).items():
+        plan = explain(conn, sql, params)
+        scans = full_scans(plan, tables)
+        if scans:
+            failures[name] = (plan, scans)
+    return failures
+
+
+if __name__ == "__main__":
+    conn = sqlite3.connect(sys.argv[1] if len(sys.argv) > 1 else ":memory:")
+    migrate(conn)
+    conn.execute("ANALYZE")
+
+    failures = check(conn)
+    for name, (sql, params) in HOT_QUERIES.items():
+        status = "❌" if name in failures else "✅"
+        print(f"{status} {name}: {' | '.join(explain(conn, sql, params))}")
+
+    conn.close()
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,79 @@
+"""
+Soil report rollups.
+
+The soil_rollup_* tables are maintained by the trg_soil_reports_rollup
+trigger (migration 4), so reads here cost O(districts) or O(days) no matter
+how many soil reports exist. Deficiency thresholds match nutrient_status()
+in app.py: N < 50, P < 30, K < 30.
+
+Rebuild from scratch after a backfill or manual edits:
+
+    cd scripts
+    python -m backend.database.rollups rebuild
+"""
+import sys
+
+from backend.database.migrations import SOIL_ROLLUP_REBUILD
+
+SUMMARY_COLUMNS = """
+    report_count,
+    ROUND(score_sum / NULLIF(report_count, 0), 1) AS avg_soil_health_score,
+    nitrogen_low,
+    phosphorus_low,
+    potassium_low
+"""
+
+
+def rebuild(conn):
+    """Recompute all rollup tables from soil_reports (caller commits)."""
+    for statement in SOIL_ROLLUP_REBUILD:
+        conn.execute(statement)
+
+
+def district_summaries(conn, district=None):
+    sql = f"""
+        SELECT district, {SUMMARY_COLUMNS}, last_report_at
+        FROM soil_rollup_district
+    """
+    params = ()
+    if district:
+        sql += " WHERE district = ?"
+        params = (district,)
+    sql += " ORDER BY district"
+    return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+
+def district_daily(conn, district, days=30):
+    rows = conn.execute(f"""
+        SELECT day, {SUMMARY_COLUMNS}
+        FROM soil_rollup_district_daily
+        WHERE district = ? AND day >= DATE('now', ?)
+        ORDER BY day
+    """, (district, f"-{int(days)} days")).fetchall()
+    return [dict(row) for row in rows]
+
+
+def farmer_summary(conn, farmer_id):
+    row = conn.execute(f"""
+        SELECT farmer_id, district, {SUMMARY_COLUMNS}, last_report_at
+        FROM soil_rollup_farmer
+        WHERE farmer_id = ?
+    """, (farmer_id,)).fetchone()
+    return dict(row) if row else None
+
+
+if __name__ == "__main__":
+    from backend.database.db import connect
+    from backend.database.migrations import migrate
+
+    if sys.argv[1:] != ["rebuild"]:
+        print("Usage: python -m backend.database.rollups rebuild")
+        sys.exit(1)
+
+    conn = connect()
+    migrate(conn)
+    rebuild(conn)
+    conn.commit()
+    count = conn.execute("SELECT COUNT(*) FROM soil_rollup_district").fetchone()[0]
+    conn.close()
+    print(f"✅ Soil rollups rebuilt for {count} districts.")
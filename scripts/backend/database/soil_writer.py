@@ -0,0 +1,254 @@
+"""
+Write-behind queue for soil report inserts.
+
+/nutrient hands its row to `SoilReportWriter.submit()` and returns without
+waiting for an fsync. A single background thread drains the bounded queue
+and commits rows in groups with executemany, either when `batch_size` rows
+are waiting or `flush_interval` seconds after the first one arrived.
+
+- Back-pressure: `submit()` raises QueueFullError when the queue is full so
+  the route can answer 503 instead of buffering without limit.
+- Durability: `stop()` drains and commits everything still queued; app.py
+  registers it with atexit so a graceful shutdown loses nothing.
+- Forking: the thread is started by the first `submit()` in each process
+  (gunicorn forks workers after app.py is imported, and a thread does not
+  survive the fork), with a fresh queue in place of the parent's copy.
+- Resilience: a batch that fails for any reason is rolled back, logged and
+  counted, and the writer moves on to the next one.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from backend.database import db
+
+COLUMNS = (
+    "farmer_id",
+    "nitrogen", "phosphorus", "potassium",
+    "ph", "temperature", "humidity", "rainfall",
+    "soil_health_score", "confidence_percentage",
+)
+
+INSERT_SQL = f"""
+    INSERT INTO soil_reports ({", ".join(COLUMNS)})
+    VALUES ({", ".join("?" for _ in COLUMNS)})
+"""
+
+COMMIT_RETRIES = 3
+
+_STOP = object()
+
+
+class QueueFullError(Exception):
+    """Raised by submit() when the writer cannot accept more reports."""
+
+
+class SoilReportWriter:
+    def __init__(self, batch_size=None, flush_interval=None, max_queue=None, db_path=None):
+        self.batch_size = batch_size or int(os.environ.get("SOIL_WRITER_BATCH_SIZE", 200))
+        self.flush_interval = flush_interval or float(os.environ.get("SOIL_WRITER_FLUSH_INTERVAL", 0.05))
+        self.max_queue = max_queue or int(os.environ.get("SOIL_WRITER_MAX_QUEUE", 10000))
+        self.db_path = db_path
+
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._submitted = 0
+        self._rejected = 0
+        self._committed = 0
+        self._failed = 0
+        self._errors = 0
+        self._batches = 0
+        self._commit_ms_total = 0.0
+        self._commit_ms_last = 0.0
+        self._commit_ms_max = 0.0
+
+    # ------------------------------------------------------------------
+    # lifecycle
+    # ------------------------------------------------------------------
+    def start(self):
+        """Start the writer thread for this process (submit() calls this)."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the parent's thread did not come along, and its
+                # queued reports are the parent's to commit
+                self._queue = queue.Queue(maxsize=self.max_queue)
+                self._thread = None
+                self._reset_stats()
+                self._pid = os.getpid()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="soil-report-writer", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def _running(self):
+        return self._pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout=30):
+        """Commit everything still queued, then stop the writer thread."""
+        if not self._running():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def flush(self):
+        """Block until every report submitted so far has been committed."""
+        if self._pid == os.getpid():
+            self._queue.join()
+
+    # ------------------------------------------------------------------
+    # producer side
+    # ------------------------------------------------------------------
+    def submit(self, report):
+        """
+        Queue one soil report. `report` is either a dict keyed by COLUMNS
+        or a tuple in COLUMNS order.
+        """
+        if isinstance(report, dict):
+            report = tuple(report[c] for c in COLUMNS)
+        if not self._running():
+            self.start()
+        try:
+            self._queue.put_nowait(report)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise QueueFullError(
+                f"Soil report queue is full ({self.max_queue} pending)"
+            )
+        with self._lock:
+            self._submitted += 1
+
+    def stats(self):
+        with self._lock:
+            batches = self._batches
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "submitted": self._submitted,
+                "committed": self._committed,
+                "failed": self._failed,
+                "errors": self._errors,
+                "rejected": self._rejected,
+                "batches": batches,
+                "avg_batch_size": round(self._committed / batches, 1) if batches else 0,
+                "commit_latency_ms": {
+                    "last": round(self._commit_ms_last, 2),
+                    "avg": round(self._commit_ms_total / batches, 2) if batches else 0,
+                    "max": round(self._commit_ms_max, 2),
+                },
+            }
+
+    # ------------------------------------------------------------------
+    # consumer side
+    # ------------------------------------------------------------------
+    def _run(self):
+        conn = db.connect(self.db_path)
+        stopping = False
+
+        try:
+            while not stopping:
+                item = self._queue.get()
+                if item is _STOP:
+                    self._queue.task_done()
+                    break
+
+                batch = [item]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=max(remaining, 0)) if remaining > 0 \
+                            else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        self._queue.task_done()
+                        stopping = True
+                        break
+                    batch.append(item)
+
+                try:
+                    self._commit(conn, batch)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+
+            # Drain anything submitted after the stop marker
+            leftover = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._queue.task_done()
+                if item is not _STOP:
+                    leftover.append(item)
+            if leftover:
+                self._commit(conn, leftover)
+        finally:
+            conn.close()
+
+    def _commit(self, conn, batch):
+        start = time.perf_counter()
+        errors = 0
+
+        try:
+            committed, failed = self._insert(conn, batch)
+        except Exception as e:
+            # Whatever went wrong, drop this batch and keep the writer alive
+            errors = 1
+            committed, failed = 0, len(batch)
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            print(f"❌ Failed to commit {len(batch)} soil reports: {e!r}")
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._committed += committed
+            self._failed += failed
+            self._errors += errors
+            self._batches += 1
+            self._commit_ms_last = elapsed_ms
+            self._commit_ms_total += elapsed_ms
+            self._commit_ms_max = max(self._commit_ms_max, elapsed_ms)
+
+    def _insert(self, conn, batch):
+        """Insert and commit `batch`; returns (committed, failed) row counts."""
+        for attempt in range(COMMIT_RETRIES + 1):
+            try:
+                conn.executemany(INSERT_SQL, batch)
+                conn.commit()
+                return len(batch), 0
+            except sqlite3.IntegrityError:
+                # One bad row (e.g. unknown farmer_id) must not sink the batch
+                conn.rollback()
+                return self._insert_rows(conn, batch)
+            except sqlite3.OperationalError:
+                # Usually a lock held past busy_timeout; retry before giving up
+                conn.rollback()
+                if attempt == COMMIT_RETRIES:
+                    raise
+                time.sleep(0.1 * (attempt + 1))
+
+    def _insert_rows(self, conn, batch):
+        committed = failed = 0
+        for row in batch:
+            try:
+                conn.execute(INSERT_SQL, row)
+                committed += 1
+            except sqlite3.IntegrityError as e:
+                failed += 1
+                print(f"❌ Dropped soil report for farmer_id {row[0]}: {e}")
+        conn.commit()
+        return committed, failed
@@ -0,0 +1,193 @@
+"""
+Deterministic synthetic data for scale testing.
+
+Populates a database with farmers spread across KARNATAKA_DISTRICTS, heads,
+access grants, soil reports and disease reports. The same --seed always
+produces the same rows. Synthetic accounts get a placeholder password hash
+and cannot log in.
+
+    cd scripts
+    python -m backend.database.synthetic --db /tmp/scale.db --farmers 500000
+"""
+import argparse
+import random
+import time
+
+from backend.database.db import DB_PATH, connect
+from backend.database.migrations import migrate
+from backend.database.access import sync_head_access
+from backend.districts import KARNATAKA_DISTRICTS
+
+CHUNK = 10_000
+PLACEHOLDER_HASH = "synthetic$no-login"
+
+CROPS = ["Tomato", "Rice", "Maize", "Ragi", "Onion", "Potato", "Sugarcane", "Cotton"]
+DISEASES = ["Leaf Blast", "Early Blight", "Late Blight", "Rust", "Leaf Curl", "Healthy"]
+SEVERITIES = ["Low", "Moderate", "High"]
+
+
+def _chunks(rows, size=CHUNK):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _timestamp(rng, days):
+    """A 'YYYY-MM-DD HH:MM:SS' string within the last `days` days."""
+    return time.strftime(
+        "%Y-%m-%d %H:%M:%S",
+        time.gmtime(time.time() - rng.random() * days * 86400)
+    )
+
+
+def _farmers(rng, start, count, villages_per_district, days):
+    districts = list(KARNATAKA_DISTRICTS)
+    for i in range(start, start + count):
+        district = rng.choice(districts)
+        coords = KARNATAKA_DISTRICTS[district]
+        yield (
+            f"synthetic_farmer_{i}",
+            PLACEHOLDER_HASH,
+            f"Farmer {i}",
+            f"{district} Village {rng.randrange(villages_per_district)}",
+            district,
+            coords["lat"],
+            coords["lon"],
+            _timestamp(rng, days),
+            0 if rng.random() < 0.02 else 1,
+        )
+
+
+def _soil_reports(rng, farmer_ids, count, days):
+    for _ in range(count):
+        n = rng.uniform(20, 140)
+        p = rng.uniform(10, 100)
+        k = rng.uniform(10, 100)
+        yield (
+            rng.choice(farmer_ids),
+            round(n, 1), round(p, 1), round(k, 1),
+            round(rng.uniform(5.0, 8.5), 1),
+            round(rng.uniform(18, 38), 1),
+            round(rng.uniform(30, 95), 1),
+            round(rng.uniform(20, 300), 1),
+            rng.randrange(40, 101, 5),
+            rng.randrange(60, 100),
+            _timestamp(rng, days),
+        )
+
+
+def _disease_reports(rng, farmer_ids, count, days):
+    for _ in range(count):
+        yield (
+            rng.choice(farmer_ids),
+            rng.choice(CROPS),
+            rng.choice(DISEASES),
+            rng.choice(SEVERITIES),
+            _timestamp(rng, days),
+        )
+
+
+def generate(conn, farmers=10_000, heads=10, soil_reports=50_000,
+             disease_reports=10_000, villages_per_district=50, days=365, seed=42):
+    """Insert synthetic rows into `conn` and return a dict of row counts."""
+    rng = random.Random(seed)
+    migrate(conn)
+
+    start = conn.execute("SELECT COALESCE(MAX(id), 0) FROM farmers").fetchone()[0]
+
+    for batch in _chunks(_farmers(rng, start, farmers, villages_per_district, days)):
+        conn.executemany("""
+            INSERT INTO farmers (
+                username, password_hash, full_name, village, district,
+                latitude, longitude, created_at, is_active
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, batch)
+    conn.commit()
+
+    farmer_ids = [
+        row[0] for row in
+        conn.execute("SELECT id FROM farmers WHERE id > ?", (start,)).fetchall()
+    ]
+
+    head_start = conn.execute("SELECT COALESCE(MAX(id), 0) FROM farmer_heads").fetchone()[0]
+    conn.executemany("""
+        INSERT INTO farmer_heads (username, password_hash, full_name)
+        VALUES (?, ?, ?)
+    """, [
+        (f"synthetic_head_{head_start + i}", PLACEHOLDER_HASH, f"Head {head_start + i}")
+        for i in range(heads)
+    ])
+    for (head_id,) in conn.execute("SELECT id FROM farmer_heads").fetchall():
+        sync_head_access(conn, head_id)
+    conn.commit()
+
+    if farmer_ids:
+        for batch in _chunks(_soil_reports(rng, farmer_ids, soil_reports, days)):
+            conn.executemany("""
+                INSERT INTO soil_reports (
+                    farmer_id,
+                    nitrogen, phosphorus, potassium,
+                    ph, temperature, humidity, rainfall,
+                    soil_health_score, confidence_percentage, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, batch)
+        conn.commit()
+
+        for batch in _chunks(_disease_reports(rng, farmer_ids, disease_reports, days)):
+            conn.executemany("""
+                INSERT INTO disease_reports (
+                    farmer_id, crop_name, disease_name, severity, created_at
+                )
+                VALUES (?, ?, ?, ?, ?)
+            """, batch)
+        conn.commit()
+
+    conn.execute("ANALYZE")
+
+    return {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("farmers", "farmer_heads", "farmer_access",
+                      "soil_reports", "disease_reports")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Populate the database with synthetic data")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--farmers", type=int, default=10_000)
+    parser.add_argument("--heads", type=int, default=10)
+    parser.add_argument("--soil-reports", type=int, default=50_000)
+    parser.add_argument("--disease-reports", type=int, default=10_000)
+    parser.add_argument("--villages-per-district", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    start = time.perf_counter()
+    counts = generate(
+        conn,
+        farmers=args.farmers,
+        heads=args.heads,
+        soil_reports=args.soil_reports,
+        disease_reports=args.disease_reports,
+        villages_per_district=args.villages_per_district,
+        days=args.days,
+        seed=args.seed,
+    )
+    conn.close()
+
+    print(f"✅ Synthetic data written to {args.db} in {time.perf_counter() - start:.1f}s")
+    for table, count in counts.items():
+        print(f"   {table}: {count}")
+
+
+if __name__ == "__main__":
+    main()
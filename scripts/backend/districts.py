@@ -0,0 +1,25 @@
+# District centroids used for farmer locations and weather lookups.
+# Farmers pick one of these at signup; their lat/lon is the centroid.
+KARNATAKA_DISTRICTS = {
+    "Bengaluru Urban": {"lat": 12.9716, "lon": 77.5946},
+    "Bengaluru Rural": {"lat": 13.2846, "lon": 77.6070},
+    "Mysuru": {"lat": 12.2958, "lon": 76.6394},
+    "Mandya": {"lat": 12.5223, "lon": 76.8974},
+    "Tumakuru": {"lat": 13.3392, "lon": 77.1130},
+    "Hassan": {"lat": 13.0068, "lon": 76.0996},
+    "Shivamogga": {"lat": 13.9299, "lon": 75.5681},
+    "Chitradurga": {"lat": 14.2306, "lon": 76.3986},
+    "Davanagere": {"lat": 14.4644, "lon": 75.9218},
+    "Ballari": {"lat": 15.1394, "lon": 76.9214},
+    "Vijayapura": {"lat": 16.8302, "lon": 75.7100},
+    "Belagavi": {"lat": 15.8497, "lon": 74.4977},
+    "Dharwad": {"lat": 15.4589, "lon": 75.0078},
+    "Kalaburagi": {"lat": 17.3297, "lon": 76.8343},
+    "Raichur": {"lat": 16.2076, "lon": 77.3463},
+    "Bidar": {"lat": 17.9149, "lon": 77.5046},
+    "Kolar": {"lat": 13.1357, "lon": 78.1326},
+    "Chikkaballapur": {"lat": 13.4355, "lon": 77.7315},
+    "Udupi": {"lat": 13.3409, "lon": 74.7421},
+    "Dakshina Kannada": {"lat": 12.8438, "lon": 75.2479},
+    "Kodagu": {"lat": 12.3375, "lon": 75.8069}
+}
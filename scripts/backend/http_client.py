@@ -0,0 +1,251 @@
+"""
+Shared outbound HTTP client.
+
+Every call to an external service (Open-Meteo, NASA POWER, GNews, the
+shelf-life model API) goes through one requests.Session per process, so
+connections are kept alive and pooled per host instead of being opened for
+each call. On top of that:
+
+- timeouts:  every request has a (connect, read) timeout, per host
+             (HOST_TIMEOUTS) or HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT
+- retries:   idempotent requests are retried up to HTTP_RETRIES times on
+             connection errors and 429/5xx, with jittered exponential backoff
+- breaker:   after HTTP_CIRCUIT_FAILURES consecutive failures a host is
+             skipped for HTTP_CIRCUIT_RESET seconds; calls fail immediately
+             with CircuitOpenError, then a single trial call decides whether
+             the circuit closes again
+- metrics:   per-host request/error/retry counts and latency percentiles,
+             exposed by stats() and GET /api/metrics
+
+CircuitOpenError subclasses requests' RequestException, so existing
+`except requests.exceptions.RequestException` handlers cover it.
+"""
+import os
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", 3))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", 10))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", 2))
+HTTP_BACKOFF = float(os.environ.get("HTTP_BACKOFF", 0.25))
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", 20))
+HTTP_CIRCUIT_FAILURES = int(os.environ.get("HTTP_CIRCUIT_FAILURES", 5))
+HTTP_CIRCUIT_RESET = float(os.environ.get("HTTP_CIRCUIT_RESET", 30))
+
+# (connect, read) seconds
+HOST_TIMEOUTS = {
+    "api.open-meteo.com": (3, 10),
+    "archive-api.open-meteo.com": (3, 20),
+    "power.larc.nasa.gov": (5, 30),
+    "gnews.io": (3, 10),
+    "127.0.0.1:8000": (1, 10),
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+LATENCY_SAMPLES = 500
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised without calling the host while its circuit is open."""
+
+
+class _HostState:
+    def __init__(self):
+        self.failures = 0           # consecutive
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+
+class HttpClient:
+    def __init__(self, retries=HTTP_RETRIES, backoff=HTTP_BACKOFF,
+                 pool_size=HTTP_POOL_SIZE, circuit_failures=HTTP_CIRCUIT_FAILURES,
+                 circuit_reset=HTTP_CIRCUIT_RESET, host_timeouts=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.circuit_failures = circuit_failures
+        self.circuit_reset = circuit_reset
+        self.host_timeouts = dict(HOST_TIMEOUTS if host_timeouts is None else host_timeouts)
+
+        self._session = None
+        self._session_pid = None
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def request(self, method, url, timeout=None, retries=None, **kwargs):
+        """
+        Like requests.request(), through the pooled session.
+        Non-idempotent methods are only retried when `retries` is given.
+        """
+        method = method.upper()
+        host = urlsplit(url).netloc
+        if retries is None:
+            retries = self.retries if method in IDEMPOTENT_METHODS else 0
+        timeout = timeout or self.host_timeouts.get(
+            host, (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        )
+
+        state = self._state(host)
+        self._acquire(host, state)
+
+        attempt = 0
+        start = time.perf_counter()
+        recorded = False
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    response = self._get_session().request(method, url, timeout=timeout, **kwargs)
+                except requests.exceptions.RequestException:
+                    failed, response = True, None
+                    if attempt >= retries:
+                        recorded = True
+                        self._record(state, start, failed=True)
+                        raise
+                else:
+                    failed = response.status_code in RETRY_STATUSES
+                    if not failed or attempt >= retries:
+                        recorded = True
+                        self._record(state, start, failed=failed)
+                        return response
+
+                attempt += 1
+                with self._lock:
+                    state.retries += 1
+                time.sleep(self._delay(attempt, response))
+        finally:
+            # Any other exception still counts as a failure and, above all,
+            # releases a half-open trial so the host is not skipped forever
+            if not recorded:
+                self._record(state, start, failed=True)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        with self._lock:
+            hosts = {host: (s, list(s.latencies)) for host, s in self._hosts.items()}
+
+        result = {}
+        for host, (s, samples) in hosts.items():
+            samples.sort()
+            result[host] = {
+                "requests": s.requests,
+                "errors": s.errors,
+                "retries": s.retries,
+                "short_circuited": s.short_circuited,
+                "circuit": self._circuit_name(s),
+                "p50_ms": _percentile(samples, 50),
+                "p95_ms": _percentile(samples, 95),
+                "p99_ms": _percentile(samples, 99),
+            }
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._session is not None and self._session_pid == os.getpid():
+                self._session.close()
+            self._session = None
+
+    # ------------------------------------------------------------------
+    def _get_session(self):
+        """One session per process; connection pools must not cross a fork."""
+        with self._lock:
+            if self._session is None or self._session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_size,
+                    pool_maxsize=self.pool_size,
+                    max_retries=0
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+                self._session_pid = os.getpid()
+            return self._session
+
+    def _state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState()
+            return state
+
+    def _acquire(self, host, state):
+        """Fail fast while the circuit is open; let one trial call through after the reset period."""
+        with self._lock:
+            if state.opened_at is None:
+                return
+            if time.time() - state.opened_at >= self.circuit_reset and not state.trial_in_flight:
+                state.trial_in_flight = True
+                return
+            state.short_circuited += 1
+        raise CircuitOpenError(f"Circuit open for {host}, skipping request")
+
+    def _record(self, state, start, failed):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            state.requests += 1
+            state.latencies.append(elapsed_ms)
+            state.trial_in_flight = False
+            if failed:
+                state.errors += 1
+                state.failures += 1
+                if state.failures >= self.circuit_failures:
+                    state.opened_at = time.time()
+            else:
+                state.failures = 0
+                state.opened_at = None
+
+    def _delay(self, attempt, response):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 10.0)
+        # Full jitter: spread retries from many workers instead of bursting together
+        return random.uniform(0, self.backoff * (2 ** (attempt - 1)))
+
+    def _circuit_name(self, state):
+        if state.opened_at is None:
+            return "closed"
+        if time.time() - state.opened_at >= self.circuit_reset:
+            return "half-open"
+        return "open"
+
+
+def _percentile(sorted_samples, pct):
+    if not sorted_samples:
+        return None
+    index = min(len(sorted_samples) - 1, int(len(sorted_samples) * pct / 100))
+    return round(sorted_samples[index], 1)
+
+
+# Process-wide client used by the backend modules
+client = HttpClient()
+
+
+def get(url, **kwargs):
+    return client.get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    return client.post(url, **kwargs)
+
+
+def stats():
+    return client.stats()
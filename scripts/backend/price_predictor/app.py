@@ -1,16 +1,25 @@
-import uvicorn
+import hashlib
 import joblib
 import numpy as np
-from fastapi import FastAPI
+import sqlite3
+import threading
+import time
 import os
-from tensorflow.keras.models import load_model
+
+from backend.database.db import get_db
+from backend.price_predictor import history_store
+from backend.price_predictor.cache import ForecastCache
+from backend.price_predictor.history_store import PriceSeries
+from backend.price_predictor.numpy_lstm import NumpyLSTMModel
+from backend.price_predictor.store import get_forecast, save_forecasts
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(BASE_DIR, "models", "global_lstm.h5")
+NUMPY_MODEL_PATH = os.path.join(BASE_DIR, "models", "global_lstm.npz")
 
-print("Loading model from:", MODEL_PATH)
-
-lstm = load_model(MODEL_PATH, compile=False)
+# "keras" (TensorFlow, global_lstm.h5) or "numpy" (numpy_lstm.py, global_lstm.npz
+# written by export_lstm.py; no TensorFlow import at all)
+LSTM_BACKEND = os.environ.get("PRICE_LSTM_BACKEND", "keras").lower()
 
 # =====================================================
 # CONFIG
@@ -19,111 +28,418 @@ LOOKBACK = 60
 SHORT_DAYS = 7
 LONG_MONTHS = 3
 
+# Prices in responses are rupees; history is stored as float32, so more
+# digits would only show its rounding error (1800.1 -> 1800.0999755859375)
+PRICE_DECIMALS = 2
+
+# Keys per LSTM forward pass in predict_batch()
+LSTM_BATCH_SIZE = int(os.environ.get("PRICE_LSTM_BATCH_SIZE", 1024))
+
 # =====================================================
 # LOAD MODELS & CACHED DATA (NO CSV)
 # =====================================================
 MODELS_DIR = os.path.join(BASE_DIR, "models")
 
-xgb = joblib.load(os.path.join(MODELS_DIR, "global_xgb.pkl"))
-scaler = joblib.load(os.path.join(MODELS_DIR, "global_scaler.pkl"))
-district_enc = joblib.load(os.path.join(MODELS_DIR, "district_encoder.pkl"))
-commodity_enc = joblib.load(os.path.join(MODELS_DIR, "commodity_encoder.pkl"))
-recent_daily = joblib.load(os.path.join(MODELS_DIR, "recent_history.pkl"))
-recent_monthly = joblib.load(os.path.join(MODELS_DIR, "recent_monthly.pkl"))
-
-# app = FastAPI(title="Agri Price Forecast API (No CSV)")
+# "auto" uses the memory-mapped store (history_store.py) once it has been
+# converted from the pickles, "pickle" / "mmap" force one or the other
+HISTORY_FORMAT = os.environ.get("PRICE_HISTORY_FORMAT", "auto").lower()
+
+# Seconds between checks for a new history generation written by ingest.py
+HISTORY_CHECK_INTERVAL = float(os.environ.get("PRICE_HISTORY_CHECK_INTERVAL", 30))
+
+lstm = xgb = scaler = None
+district_enc = commodity_enc = {}
+recent_daily = recent_monthly = {}
+history_format = None
+history_manifest = None
+market_index = commodity_districts = {}
+DATA_VERSION = None
+_history_checked = 0.0
+
+forecast_cache = ForecastCache()
+_reload_lock = threading.Lock()
+
+_medium_table = None
+_medium_lock = threading.Lock()
+
+# Commodity slot of district-wide cache keys, (district, DISTRICT_WIDE, version)
+DISTRICT_WIDE = "*"
+
+
+def artifact_files(fmt):
+    """Files that determine the forecasts, for the given history format."""
+    # The memory-mapped history is identified by its manifest's base hash
+    # instead, which daily ingests leave unchanged
+    history = [] if fmt == "mmap" else list(history_store.STORES.values())
+    return [
+        os.path.basename(NUMPY_MODEL_PATH if LSTM_BACKEND == "numpy" else MODEL_PATH),
+        "global_xgb.pkl", "global_scaler.pkl",
+        "district_encoder.pkl", "commodity_encoder.pkl",
+        *history,
+    ]
+
+
+def artifacts_version(fmt, models_dir=MODELS_DIR, manifest=None):
+    """Content hash of the model and history files; stamps stored forecasts."""
+    digest = hashlib.sha256()
+    for name in artifact_files(fmt):
+        digest.update(name.encode())
+        with open(os.path.join(models_dir, name), "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    if manifest is not None:
+        digest.update(manifest["base"].encode())
+    return digest.hexdigest()[:16]
+
+
+def load_lstm():
+    if LSTM_BACKEND == "numpy":
+        print("Loading NumPy LSTM from:", NUMPY_MODEL_PATH)
+        return NumpyLSTMModel.load(NUMPY_MODEL_PATH)
+    if LSTM_BACKEND != "keras":
+        raise ValueError(f"Unknown PRICE_LSTM_BACKEND: {LSTM_BACKEND}")
+
+    # TensorFlow is only imported when the Keras backend is selected
+    from tensorflow.keras.models import load_model
+    print("Loading model from:", MODEL_PATH)
+    return load_model(MODEL_PATH, compile=False)
+
+
+def load_history():
+    """Return (recent_daily, recent_monthly, format, manifest or None)."""
+    if HISTORY_FORMAT == "mmap" or (HISTORY_FORMAT == "auto" and history_store.available(MODELS_DIR)):
+        daily, monthly, manifest = history_store.load_current(MODELS_DIR)
+        return daily, monthly, "mmap", manifest
+    if HISTORY_FORMAT not in ("auto", "pickle"):
+        raise ValueError(f"Unknown PRICE_HISTORY_FORMAT: {HISTORY_FORMAT}")
+    return (joblib.load(os.path.join(MODELS_DIR, "recent_history.pkl")),
+            joblib.load(os.path.join(MODELS_DIR, "recent_monthly.pkl")), "pickle", None)
+
+
+def reload_artifacts():
+    """
+    (Re)load the model and history files from MODELS_DIR, e.g. after a
+    retrain or a new history export, and drop every cached forecast.
+    Returns the new DATA_VERSION.
+    """
+    global lstm, xgb, scaler, district_enc, commodity_enc
+    global recent_daily, recent_monthly, history_format, history_manifest, DATA_VERSION
+    global market_index, commodity_districts, _history_checked
+
+    with _reload_lock:
+        new_lstm = load_lstm()
+        loaded = {
+            name: joblib.load(os.path.join(MODELS_DIR, f"{name}.pkl"))
+            for name in ("global_xgb", "global_scaler", "district_encoder", "commodity_encoder")
+        }
+        daily, monthly, fmt, manifest = load_history()
+        version = artifacts_version(fmt, manifest=manifest)
+        index, by_commodity = build_market_index(daily)
+
+        lstm = new_lstm
+        xgb = loaded["global_xgb"]
+        scaler = loaded["global_scaler"]
+        district_enc = loaded["district_encoder"]
+        commodity_enc = loaded["commodity_encoder"]
+        recent_daily = daily
+        recent_monthly = monthly
+        history_format = fmt
+        history_manifest = manifest
+        market_index, commodity_districts = index, by_commodity
+        DATA_VERSION = version
+        _history_checked = time.monotonic()
+
+        forecast_cache.invalidate()
+        return DATA_VERSION
+
+
+def refresh_history(force=False):
+    """
+    Swap in a newer history generation written by ingest.py, at most once
+    per HISTORY_CHECK_INTERVAL. Only the cached forecasts of keys whose
+    series changed are dropped. Returns the number of changed keys.
+    """
+    global recent_daily, recent_monthly, history_manifest, _history_checked
+    global market_index, commodity_districts
+
+    if history_format != "mmap":
+        return 0
+    now = time.monotonic()
+    if not force and now - _history_checked < HISTORY_CHECK_INTERVAL:
+        return 0
+
+    with _reload_lock:
+        _history_checked = now
+        manifest = history_store.read_manifest(MODELS_DIR)
+        if manifest is None or manifest["generation"] == history_manifest["generation"]:
+            return 0
+        rebuilt = (manifest["base"] != history_manifest["base"]
+                   or manifest["generation"] < history_manifest["generation"])
+
+        if not rebuilt:
+            try:
+                daily, monthly, manifest = history_store.load_current(MODELS_DIR)
+            except FileNotFoundError as e:
+                # Old generation removed while loading; try again next time
+                print(f"WARNING: Price history reload failed: {e}")
+                return 0
+
+            old_generation = history_manifest["generation"]
+            changed = {
+                key for series in (daily, monthly) for key in series
+                if series.generation(key) > old_generation
+            }
+            index, by_commodity = build_market_index(daily)
+            recent_daily = daily
+            recent_monthly = monthly
+            history_manifest = manifest
+            market_index, commodity_districts = index, by_commodity
+
+            changed_districts = {district for district, _ in changed}
+            forecast_cache.invalidate(
+                lambda cache_key: cache_key[:2] in changed
+                or (cache_key[1] == DISTRICT_WIDE and cache_key[0] in changed_districts)
+            )
+            return len(changed)
+
+    # Re-converted from the pickles: every series may have changed
+    reload_artifacts()
+    return len(recent_daily)
+
+
+def _generation(series, key):
+    return series.generation(key) if key in series else 0
+
+
+def _key_generation(key):
+    return max(_generation(recent_daily, key), _generation(recent_monthly, key))
+
+
+def key_version(key):
+    """Stamp for one key's forecast: DATA_VERSION plus its series generation."""
+    if history_format != "mmap":
+        return DATA_VERSION
+    return f"{DATA_VERSION}.g{_key_generation(key)}"
+
+
+def cache_stats():
+    return {
+        "data_version": DATA_VERSION,
+        "lstm_backend": LSTM_BACKEND,
+        "history_format": history_format,
+        "history_generation": history_manifest["generation"] if history_manifest else None,
+        "history_updated_at": history_manifest["updated_at"] if history_manifest else None,
+        **forecast_cache.stats()
+    }
 
 # =====================================================
-# METADATA ENDPOINTS
+# METADATA (/districts, /commodities/<district>)
 # =====================================================
-# @app.get("/districts")
-# def get_districts():
-#     return {"districts": sorted(district_enc.keys())}
+def build_market_index(daily):
+    """
+    Built once per history load: district -> commodities sorted by name,
+    each with its history length and last observed date, plus
+    commodity -> sorted districts.
+    """
+    mmap = isinstance(daily, PriceSeries)
+    index = {}
+    for district, commodity in daily:
+        key = (district, commodity)
+        last = daily.last_date(key) if mmap else None
+        index.setdefault(district, []).append({
+            "commodity": commodity,
+            "days": daily.length(key) if mmap else len(daily[key]),
+            "last_date": last.isoformat() if last else None,
+        })
+
+    index = {
+        district: sorted(index[district], key=lambda e: e["commodity"])
+        for district in sorted(index)
+    }
+    by_commodity = {}
+    for district, entries in index.items():
+        for entry in entries:
+            entry["forecastable"] = entry["days"] >= LOOKBACK
+            by_commodity.setdefault(entry["commodity"], []).append(district)
+    return index, by_commodity
 
 
-# @app.get("/commodities/{district}")
-# def get_commodities(district: str):
-#     district = district.strip().title()
-#     commodities = sorted({
-#         c for (d, c) in recent_daily.keys() if d == district
-#     })
-#     return {"commodities": commodities}
+def _name(value: str):
+    # Accepts "Mysore", "mysore" and frontend slugs like "bengal_gram"
+    return value.strip().replace("_", " ").title()
 
 
-def predict(district: str, commodity: str):
+def districts(commodity=None):
+    """Sorted districts with price history, optionally only those trading `commodity`."""
+    refresh_history()
+    if commodity:
+        return list(commodity_districts.get(_name(commodity), []))
+    return list(market_index)
+
+
+def commodities(district):
+    """Index entries for `district`, or None when it has no price history."""
+    refresh_history()
+    return market_index.get(_name(district))
+
+
+reload_artifacts()
 
-    district = district.strip().title()
-    commodity = commodity.strip().title()
 
-    # ---------------------------
-    # VALIDATION
-    # ---------------------------
+def normalize_key(district: str, commodity: str):
+    return district.strip().title(), commodity.strip().title()
+
+
+def _check(key):
+    """Error message for a key that cannot be forecast, else None."""
+    district, commodity = key
+
     if district not in district_enc:
-        return {"error": f"Unknown district: {district}"}
+        return f"Unknown district: {district}"
 
     if commodity not in commodity_enc:
-        return {"error": f"Unknown commodity: {commodity}"}
-
-    key = (district, commodity)
+        return f"Unknown commodity: {commodity}"
 
     if key not in recent_daily or len(recent_daily[key]) < LOOKBACK:
-        return {"error": "Not enough recent daily data"}
+        return "Not enough recent daily data"
+
+    return None
 
-    # =====================================================
-    # SHORT-TERM FORECAST (GLOBAL LSTM)
-    # =====================================================
-    prices = np.array(recent_daily[key][-LOOKBACK:]).reshape(-1, 1)
-    current_price = float(prices[-1][0])
 
-    prices_scaled = scaler.transform(prices)
+# =====================================================
+# SHORT-TERM FORECAST (GLOBAL LSTM)
+# =====================================================
+def forecast_short_term(keys):
+    """
+    7-day forecasts for many valid keys at once: their 60-day windows are
+    stacked into one (n, LOOKBACK, 4) tensor and rolled forward together,
+    so the LSTM runs SHORT_DAYS times in total instead of per key.
+    Returns an (n, SHORT_DAYS) array of prices.
+    """
+    n = len(keys)
+    if n == 0:
+        return np.empty((0, SHORT_DAYS))
+
+    windows = np.array([recent_daily[key][-LOOKBACK:] for key in keys], dtype=np.float64)
+    seq = scaler.transform(windows.reshape(-1, 1)).reshape(n, LOOKBACK)
 
-    d_id = district_enc[district]
-    c_id = commodity_enc[commodity]
     month = 1  # fixed (can be replaced with current month later)
+    meta = np.array(
+        [[district_enc[d], commodity_enc[c], month] for d, c in keys],
+        dtype=np.float32
+    )
+    meta_seq = np.repeat(meta[:, np.newaxis, :], LOOKBACK, axis=1)
+
+    short_scaled = np.empty((n, SHORT_DAYS))
+
+    for step in range(SHORT_DAYS):
+        X = np.concatenate([seq[:, :, np.newaxis], meta_seq], axis=2)
+        p = lstm.predict(X, verbose=0, batch_size=LSTM_BATCH_SIZE)[:, 0]
+        short_scaled[:, step] = p
+
+        seq = np.concatenate([seq[:, 1:], p[:, np.newaxis]], axis=1)
+
+    return scaler.inverse_transform(
+        short_scaled.reshape(-1, 1)
+    ).reshape(n, SHORT_DAYS)
+
 
-    meta = np.array([d_id, c_id, month], dtype=np.float32)
-    meta_seq = np.repeat(meta[np.newaxis, :], LOOKBACK, axis=0)
-
-    seq = prices_scaled.copy()
-    X = np.concatenate([seq, meta_seq], axis=1).reshape(1, LOOKBACK, 4)
-
-    short_scaled = []
-
-    for _ in range(SHORT_DAYS):
-        p = lstm.predict(X, verbose=0)[0, 0]
-        short_scaled.append(p)
-
-        seq = np.vstack([seq[1:], [[p]]])
-        X = np.concatenate([seq, meta_seq], axis=1).reshape(1, LOOKBACK, 4)
-
-    short_forecast = scaler.inverse_transform(
-        np.array(short_scaled).reshape(-1, 1)
-    ).flatten()
-
-    # =====================================================
-    # MEDIUM-TERM FORECAST (GLOBAL XGBOOST)
-    # =====================================================
-    long_forecast = []
-
-    if key in recent_monthly and len(recent_monthly[key]) >= 3:
-        lags = recent_monthly[key][-3:]
-
-        for i in range(LONG_MONTHS):
-            Xg = [[
-                lags[-1],
-                lags[-2],
-                lags[-3],
-                i + 1,
-                d_id,
-                c_id
-            ]]
-            p = float(xgb.predict(Xg)[0])
-            long_forecast.append(p)
-            lags = lags[1:] + [p]
-
-    # =====================================================
-    # FARMER ADVISORY
-    # =====================================================
+# =====================================================
+# MEDIUM-TERM FORECAST (GLOBAL XGBOOST)
+# =====================================================
+def forecast_medium_term_batch(keys):
+    """
+    Medium-term forecasts for many keys with 3+ monthly values: one
+    (n, 6) lag feature matrix, so xgb.predict runs LONG_MONTHS times in
+    total. Returns an (n, LONG_MONTHS) array of prices.
+    """
+    n = len(keys)
+    if n == 0:
+        return np.empty((0, LONG_MONTHS))
+
+    # Oldest first, like recent_monthly[key][-3:]
+    lags = np.array([recent_monthly[key][-3:] for key in keys], dtype=np.float64)
+    ids = np.array(
+        [[district_enc[d], commodity_enc[c]] for d, c in keys],
+        dtype=np.float64
+    )
+
+    long_forecast = np.empty((n, LONG_MONTHS))
+    for i in range(LONG_MONTHS):
+        Xg = np.column_stack([
+            lags[:, -1],
+            lags[:, -2],
+            lags[:, -3],
+            np.full(n, i + 1),
+            ids
+        ])
+        p = xgb.predict(Xg)
+        long_forecast[:, i] = p
+        lags = np.column_stack([lags[:, 1:], p])
+
+    return long_forecast
+
+
+def _medium_term_keys(monthly, keys=None):
+    return [
+        key for key in (monthly if keys is None else keys)
+        if key[0] in district_enc and key[1] in commodity_enc
+        and key in monthly and len(monthly[key]) >= 3
+    ]
+
+
+def medium_term_table():
+    """
+    {(district, commodity): [LONG_MONTHS prices]} for every key of
+    recent_monthly that can be forecast. Built on first use; after an
+    ingest only the keys whose monthly series changed are recomputed.
+    """
+    global _medium_table
+
+    monthly = recent_monthly
+    table = _medium_table
+    if table is not None and table["monthly"] is monthly:
+        return table["forecasts"]
+
+    with _medium_lock:
+        table = _medium_table
+        if table is not None and table["monthly"] is monthly:
+            return table["forecasts"]
+
+        mmap = isinstance(monthly, PriceSeries)
+        if (table is not None and mmap and table["version"] == DATA_VERSION
+                and isinstance(table["monthly"], PriceSeries)):
+            changed = [key for key in monthly if monthly.generation(key) > table["generation"]]
+            forecasts = {
+                key: value for key, value in table["forecasts"].items()
+                if key in monthly and monthly.generation(key) <= table["generation"]
+            }
+            keys = _medium_term_keys(monthly, changed)
+        else:
+            forecasts = {}
+            keys = _medium_term_keys(monthly)
+
+        values = forecast_medium_term_batch(keys).tolist()
+        forecasts.update(zip(keys, values))
+
+        _medium_table = {
+            "monthly": monthly,
+            "version": DATA_VERSION,
+            "generation": int(monthly.generations.max()) if mmap and len(monthly) else 0,
+            "forecasts": forecasts,
+        }
+        return forecasts
+
+
+def forecast_medium_term(key):
+    """LONG_MONTHS prices for one key (empty without 3 monthly values)."""
+    return list(medium_term_table().get(key, []))
+
+
+# =====================================================
+# FARMER ADVISORY
+# =====================================================
+def farmer_advisory(current_price, short_forecast, long_forecast):
     advisory = []
     avg_short = np.mean(short_forecast)
 
@@ -143,19 +459,157 @@ def predict(district: str, commodity: str):
         else:
             advisory.append("Long-term: Stable outlook.")
 
-    # =====================================================
-    # RESPONSE
-    # =====================================================
+    return advisory
+
+
+def _response(current_price, short_forecast, long_forecast):
     return {
-        "current_price": current_price,
+        "current_price": round(current_price, PRICE_DECIMALS),
         "short_term_forecast": {
-            f"Day {i+1}": float(v) for i, v in enumerate(short_forecast)
+            f"Day {i+1}": round(float(v), PRICE_DECIMALS) for i, v in enumerate(short_forecast)
         },
         "medium_term_forecast": {
-            f"Month +{i+1}": float(v) for i, v in enumerate(long_forecast)
+            f"Month +{i+1}": round(float(v), PRICE_DECIMALS) for i, v in enumerate(long_forecast)
         },
-        "farmer_advisory": advisory
+        "farmer_advisory": farmer_advisory(current_price, short_forecast, long_forecast)
     }
 
 
+# =====================================================
+# PUBLIC API
+# =====================================================
+def predict_batch(keys):
+    """
+    Forecast many (district, commodity) pairs in one batched pass.
+    Returns one result per input pair, in order; invalid pairs get
+    {"error": ...} like predict().
+    """
+    refresh_history()
+    return _predict_batch(keys)
+
+
+def _predict_batch(keys):
+    """predict_batch() against the history as loaded (no refresh check)."""
+    keys = [normalize_key(d, c) for d, c in keys]
+    errors = {key: _check(key) for key in set(keys)}
+    valid = [key for key in dict.fromkeys(keys) if errors[key] is None]
+
+    short = dict(zip(valid, forecast_short_term(valid)))
 
+    results = {}
+    for key in valid:
+        current_price = float(recent_daily[key][-1])
+        results[key] = _response(current_price, short[key], forecast_medium_term(key))
+
+    return [
+        results[key] if errors[key] is None else {"error": errors[key]}
+        for key in keys
+    ]
+
+
+def predict(district: str, commodity: str):
+    """
+    Forecast for one pair, from the first of:
+    the in-process LRU cache, the precomputed row for the loaded artifacts
+    (precompute.py), or computed now and stored in both.
+    """
+    refresh_history()
+    key = normalize_key(district, commodity)
+    version = key_version(key)
+    cache_key = (*key, version)
+
+    cached = forecast_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    stored = None
+    try:
+        with get_db() as conn:
+            stored = get_forecast(conn, key, version)
+    except sqlite3.Error as e:
+        print(f"WARNING: Forecast store unavailable: {e}")
+    if stored is not None:
+        forecast_cache.put(cache_key, stored)
+        return stored
+
+    result = _predict_batch([key])[0]
+
+    if "error" not in result:
+        forecast_cache.put(cache_key, result)
+        try:
+            with get_db() as conn:
+                save_forecasts(conn, [(key, version, result)])
+        except sqlite3.Error as e:
+            print(f"WARNING: Could not store forecast: {e}")
+    return result
+
+
+def _rank(forecasts, field):
+    """Commodities ordered by `field`, highest expected change first."""
+    ranked = [f for f in forecasts if f[field] is not None]
+    return [f["commodity"] for f in sorted(ranked, key=lambda f: f[field], reverse=True)]
+
+
+def _change_pct(current_price, forecast):
+    if not len(forecast) or not current_price:
+        return None
+    return round((float(np.mean(forecast)) / current_price - 1) * 100, 2)
+
+
+def predict_district(district: str):
+    """
+    Forecasts for every commodity of `district` with enough history, from
+    one predict_batch() pass, ranked by expected short- and medium-term
+    change. Cached like predict(), and each commodity's result is cached
+    for /predict too. Returns None for a district without price history.
+    """
+    refresh_history()
+    name = _name(district)
+    entries = market_index.get(name)
+    if entries is None:
+        return None
+
+    keys = [(name, entry["commodity"]) for entry in entries if entry["forecastable"]]
+    version = DATA_VERSION
+    if history_format == "mmap":
+        # Any ingest touching the district moves its newest generation
+        version = f"{DATA_VERSION}.g{max(map(_key_generation, keys), default=0)}"
+    cache_key = (name, DISTRICT_WIDE, version)
+
+    cached = forecast_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    forecasts, skipped = [], []
+    for key, result in zip(keys, _predict_batch(keys)):
+        if "error" in result:
+            skipped.append({"commodity": key[1], "error": result["error"]})
+            continue
+        forecast_cache.put((*key, key_version(key)), result)
+
+        short = list(result["short_term_forecast"].values())
+        medium = list(result["medium_term_forecast"].values())
+        forecasts.append({
+            "commodity": key[1],
+            "short_term_change_pct": _change_pct(result["current_price"], short),
+            "medium_term_change_pct": _change_pct(result["current_price"], medium),
+            **result
+        })
+    skipped += [
+        {"commodity": entry["commodity"], "error": "Not enough recent daily data"}
+        for entry in entries if not entry["forecastable"]
+    ]
+
+    ranking = {
+        "short_term": _rank(forecasts, "short_term_change_pct"),
+        "medium_term": _rank(forecasts, "medium_term_change_pct"),
+    }
+    order = {commodity: i for i, commodity in enumerate(ranking["short_term"])}
+    response = {
+        "district": name,
+        "commodities": sorted(forecasts, key=lambda f: order.get(f["commodity"], len(order))),
+        "ranking": ranking,
+        "skipped": skipped,
+    }
+    forecast_cache.put(cache_key, response)
+    return response
@@ -0,0 +1,73 @@
+"""
+In-process LRU cache for price forecasts.
+
+Keys are (district, commodity, data_version), so forecasts computed from
+older artifacts can never be served; reload_artifacts() in app.py also
+clears the cache so their memory is released immediately. Entries expire
+after `ttl` seconds and the least recently used entry is evicted once
+`max_entries` is reached.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+PRICE_CACHE_SIZE = int(os.environ.get("PRICE_CACHE_SIZE", 2048))
+PRICE_CACHE_TTL = float(os.environ.get("PRICE_CACHE_TTL", 3600))
+
+
+class ForecastCache:
+    def __init__(self, max_entries=PRICE_CACHE_SIZE, ttl=PRICE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()     # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, match=None):
+        """Drop entries whose key satisfies `match(key)`, or all of them."""
+        with self._lock:
+            if match is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                stale = [key for key in self._entries if match(key)]
+                for key in stale:
+                    del self._entries[key]
+                dropped = len(stale)
+            self._stats["invalidations"] += dropped
+        return dropped
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0
+        return stats
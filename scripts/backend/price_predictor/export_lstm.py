@@ -0,0 +1,231 @@
+"""
+Export the Keras price LSTM for the NumPy backend, and check the two agree.
+
+    cd scripts
+    python -m backend.price_predictor.export_lstm export
+    python -m backend.price_predictor.export_lstm verify --samples 500
+    python -m backend.price_predictor.export_lstm compare
+    python -m backend.price_predictor.export_lstm check
+
+export   global_lstm.h5 -> global_lstm.npz (weights + layer configs)
+verify   runs both backends on real history windows (plus random inputs) and
+         fails if any prediction differs by more than --tolerance
+check    runs the NumPy backend on a fixed one-unit model and compares it
+         with a step worked out by hand; needs neither TensorFlow nor the
+         trained model
+compare  loads each backend in a fresh interpreter and reports startup
+         time, peak RSS and per-batch latency
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+H5_PATH = os.path.join(MODELS_DIR, "global_lstm.h5")
+NPZ_PATH = os.path.join(MODELS_DIR, "global_lstm.npz")
+
+LOOKBACK = 60
+FEATURES = 4
+
+
+def _activation_name(activation):
+    name = activation if isinstance(activation, str) else activation.__name__
+    return name.lower()
+
+
+def export(h5_path=H5_PATH, npz_path=NPZ_PATH):
+    from tensorflow.keras.models import load_model
+
+    model = load_model(h5_path, compile=False)
+    configs, arrays = [], {}
+
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind in ("InputLayer", "Dropout"):
+            continue
+        if kind not in ("LSTM", "Dense"):
+            raise ValueError(f"Layer {layer.name} ({kind}) is not supported by the NumPy backend")
+
+        config = {"type": kind, "name": layer.name, "activation": _activation_name(layer.activation)}
+        if kind == "LSTM":
+            if layer.go_backwards or layer.stateful:
+                raise ValueError(f"Layer {layer.name}: go_backwards/stateful LSTMs are not supported")
+            config["recurrent_activation"] = _activation_name(layer.recurrent_activation)
+            config["return_sequences"] = bool(layer.return_sequences)
+
+        weights = layer.get_weights()
+        config["n_weights"] = len(weights)
+        index = len(configs)
+        for j, w in enumerate(weights):
+            arrays[f"layer{index}_w{j}"] = w.astype(np.float32)
+        configs.append(config)
+
+    np.savez(npz_path, config=np.array(json.dumps(configs)), **arrays)
+    return npz_path, configs
+
+
+def _windows(samples, seed=0):
+    """Real scaled history windows where the artifacts exist, else random ones."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(0.5, 0.3, size=(samples, LOOKBACK, FEATURES)).astype(np.float32)
+    try:
+        import joblib
+        scaler = joblib.load(os.path.join(MODELS_DIR, "global_scaler.pkl"))
+        recent_daily = joblib.load(os.path.join(MODELS_DIR, "recent_history.pkl"))
+        district_enc = joblib.load(os.path.join(MODELS_DIR, "district_encoder.pkl"))
+        commodity_enc = joblib.load(os.path.join(MODELS_DIR, "commodity_encoder.pkl"))
+    except (OSError, ImportError):
+        return X
+
+    keys = [
+        (d, c) for (d, c), history in recent_daily.items()
+        if len(history) >= LOOKBACK and d in district_enc and c in commodity_enc
+    ][:samples // 2]
+    for n, (d, c) in enumerate(keys):
+        window = np.asarray(recent_daily[(d, c)][-LOOKBACK:], dtype=np.float64).reshape(-1, 1)
+        X[n, :, 0] = scaler.transform(window)[:, 0]
+        X[n, :, 1:] = [district_enc[d], commodity_enc[c], 1]
+    return X
+
+
+def verify(samples=500, tolerance=1e-4):
+    from tensorflow.keras.models import load_model
+    from backend.price_predictor.numpy_lstm import NumpyLSTMModel
+
+    X = _windows(samples)
+    keras_out = load_model(H5_PATH, compile=False).predict(X, verbose=0)
+    numpy_out = NumpyLSTMModel.load(NPZ_PATH).predict(X)
+
+    diff = np.abs(keras_out - numpy_out)
+    print(f"{samples} windows: max abs diff {diff.max():.2e}, mean {diff.mean():.2e}")
+    return diff.max() <= tolerance
+
+
+# One LSTM unit (Keras gate order i, f, c, o, hard_sigmoid gates) and a
+# linear Dense head. The gate weights all differ, so a wrong gate order
+# changes the output, and the output gate saturates, so the hard_sigmoid
+# clip is exercised.
+FIXTURE_LAYERS = [
+    ({"type": "LSTM", "activation": "tanh", "recurrent_activation": "hard_sigmoid",
+      "return_sequences": False},
+     [[[0.5, -1.0, 2.0, 3.0]], [[0.1, 0.2, -0.3, 0.4]], [0.0, 0.0, 0.0, 0.0]]),
+    ({"type": "Dense", "activation": "linear"}, [[[2.0]], [0.5]]),
+]
+
+
+def _fixture_step(x, h, c):
+    """One step of the fixture LSTM in plain floats."""
+    def hard_sigmoid(v):
+        return min(1.0, max(0.0, 0.2 * v + 0.5))
+
+    i = hard_sigmoid(0.5 * x + 0.1 * h)
+    f = hard_sigmoid(-1.0 * x + 0.2 * h)
+    g = math.tanh(2.0 * x - 0.3 * h)
+    o = hard_sigmoid(3.0 * x + 0.4 * h)
+    c = f * c + i * g
+    return o * math.tanh(c), c
+
+
+def check(tolerance=1e-6):
+    """Compare the NumPy backend with the fixture; returns the failures."""
+    from backend.price_predictor.numpy_lstm import NumpyLSTMModel
+
+    model = NumpyLSTMModel(FIXTURE_LAYERS)
+    failures = []
+
+    # x = 1 from zero state: z = (0.5, -1, 2, 3), so i = 0.6, f = 0.3,
+    # g = tanh(2), o = clip(1.1) = 1; c = 0.6 tanh(2), h = tanh(c) ~ 0.521514
+    expected = 2.0 * math.tanh(0.6 * math.tanh(2.0)) + 0.5
+    got = float(model.predict(np.array([[[1.0]]]))[0, 0])
+    if abs(got - expected) > tolerance:
+        failures.append(f"single step: got {got:.6f}, expected {expected:.6f}")
+
+    sequences = [[1.0, -0.5, 2.0], [0.0, 3.0, -4.0, 0.25], [-2.0] * 5]
+    for sequence in sequences:
+        h = c = 0.0
+        for x in sequence:
+            h, c = _fixture_step(x, h, c)
+        expected = 2.0 * h + 0.5
+        got = float(model.predict(np.array([[[x] for x in sequence]]))[0, 0])
+        if abs(got - expected) > tolerance:
+            failures.append(f"sequence {sequence}: got {got:.6f}, expected {expected:.6f}")
+    return failures
+
+
+_PROBE = """
+import resource, sys, time
+import numpy as np
+start = time.perf_counter()
+backend, h5, npz = sys.argv[1:4]
+if backend == "keras":
+    from tensorflow.keras.models import load_model
+    model = load_model(h5, compile=False)
+else:
+    from backend.price_predictor.numpy_lstm import NumpyLSTMModel
+    model = NumpyLSTMModel.load(npz)
+load_s = time.perf_counter() - start
+X = np.random.default_rng(0).normal(size=(int(sys.argv[4]), 60, 4)).astype(np.float32)
+model.predict(X, verbose=0)
+start = time.perf_counter()
+for _ in range(5):
+    model.predict(X, verbose=0)
+predict_ms = (time.perf_counter() - start) / 5 * 1000
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(f"{load_s:.2f} {rss_mb:.0f} {predict_ms:.1f}")
+"""
+
+
+def compare(batch=256):
+    scripts_dir = os.path.dirname(os.path.dirname(BASE_DIR))
+    print(f"{'backend':<8}{'startup s':>11}{'peak RSS MB':>13}{f'predict({batch}) ms':>18}")
+    for backend in ("keras", "numpy"):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE, backend, H5_PATH, NPZ_PATH, str(batch)],
+            capture_output=True, text=True, cwd=scripts_dir, check=True
+        ).stdout.split()[-3:]
+        load_s, rss_mb, predict_ms = out
+        print(f"{backend:<8}{load_s:>11}{rss_mb:>13}{predict_ms:>18}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy backend for the price LSTM")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("export")
+    verify_parser = sub.add_parser("verify")
+    verify_parser.add_argument("--samples", type=int, default=500)
+    verify_parser.add_argument("--tolerance", type=float, default=1e-4)
+    compare_parser = sub.add_parser("compare")
+    compare_parser.add_argument("--batch", type=int, default=256)
+    sub.add_parser("check")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        start = time.perf_counter()
+        path, configs = export()
+        layers = ", ".join(f"{c['type']}({c['name']})" for c in configs)
+        print(f"✅ Wrote {path} [{layers}] in {time.perf_counter() - start:.1f}s")
+    elif args.command == "verify":
+        if not verify(args.samples, args.tolerance):
+            print(f"❌ Backends differ by more than {args.tolerance}")
+            sys.exit(1)
+        print("✅ NumPy backend matches Keras")
+    elif args.command == "check":
+        failures = check()
+        if failures:
+            for failure in failures:
+                print(f"❌ {failure}")
+            sys.exit(1)
+        print("✅ NumPy backend matches the hand-computed fixture")
+    else:
+        compare(args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Memory-mapped price history.
+
+recent_history.pkl / recent_monthly.pkl are dicts of (district, commodity)
+-> list of floats: every worker unpickles all of it into boxed Python
+floats at import. The store keeps the same series as
+
+    <name>_values[.gN].npy   every series back to back, one contiguous
+                             float32 array
+    <name>_index[.gN].npz    district/commodity name tables, and per series
+                             the district id, commodity id, offset, length,
+                             last observed date, days averaged into the last
+                             value (monthly series) and the generation in
+                             which the series last changed
+
+The values file is memory-mapped read-only, so workers on a host share its
+pages and a series lookup is a slice (no copy). PriceSeries behaves like
+the original dict for reads (`series[key]`, `key in series`, iteration,
+`len`), so price_predictor/app.py uses either interchangeably.
+
+price_history.json names the current generation. convert writes
+generation 0; each daily ingest (ingest.py) writes generation N + 1 and
+then replaces the manifest, which running workers pick up without a
+restart. `base` identifies the converted history and stays the same across
+ingests, so it can stamp forecasts without invalidating all of them.
+
+    cd scripts
+    python -m backend.price_predictor.history_store convert --as-of 2026-01-20
+    python -m backend.price_predictor.history_store measure
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import date, datetime
+
+import numpy as np
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+STORES = {"recent_history": "recent_history.pkl", "recent_monthly": "recent_monthly.pkl"}
+MANIFEST = "price_history.json"
+
+
+def store_paths(name, directory=MODELS_DIR, generation=0):
+    suffix = f".g{generation}" if generation else ""
+    return (os.path.join(directory, f"{name}_values{suffix}.npy"),
+            os.path.join(directory, f"{name}_index{suffix}.npz"))
+
+
+class PriceSeries:
+    def __init__(self, values, districts, commodities, district_ids, commodity_ids,
+                 offsets, lengths, last_dates=None, month_days=None, generations=None):
+        n = len(offsets)
+        self.values = values
+        self.districts = list(districts)
+        self.commodities = list(commodities)
+        self.district_ids = district_ids
+        self.commodity_ids = commodity_ids
+        self.offsets = offsets
+        self.lengths = lengths
+        # date.toordinal(), 0 where unknown
+        self.last_dates = last_dates if last_dates is not None else np.zeros(n, dtype=np.int32)
+        self.month_days = month_days if month_days is not None else np.zeros(n, dtype=np.int16)
+        self.generations = generations if generations is not None else np.zeros(n, dtype=np.int32)
+        self._rows = {
+            (self.districts[d], self.commodities[c]): row
+            for row, (d, c) in enumerate(zip(district_ids.tolist(), commodity_ids.tolist()))
+        }
+
+    # ------------------------------------------------------------------
+    # dict-like reads
+    # ------------------------------------------------------------------
+    def __getitem__(self, key):
+        row = self._rows[key]
+        start = self.offsets[row]
+        return self.values[start:start + self.lengths[row]]
+
+    def get(self, key, default=None):
+        return self[key] if key in self._rows else default
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def keys(self):
+        return self._rows.keys()
+
+    def items(self):
+        return ((key, self[key]) for key in self._rows)
+
+    # ------------------------------------------------------------------
+    # per-series metadata
+    # ------------------------------------------------------------------
+    def length(self, key):
+        """Series length without touching the values pages."""
+        return int(self.lengths[self._rows[key]])
+
+    def last_date(self, key):
+        ordinal = int(self.last_dates[self._rows[key]])
+        return date.fromordinal(ordinal) if ordinal else None
+
+    def generation(self, key):
+        return int(self.generations[self._rows[key]])
+
+    def meta(self, key):
+        """(last_date, month_days, generation) for ingest.py."""
+        row = self._rows[key]
+        return int(self.last_dates[row]), int(self.month_days[row]), int(self.generations[row])
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_dict(cls, series, meta=None):
+        """
+        Build from {key: sequence of prices}; `meta` optionally maps keys to
+        (last_date ordinal, month_days, generation).
+        """
+        meta = meta or {}
+        districts = sorted({d for d, _ in series})
+        commodities = sorted({c for _, c in series})
+        d_index = {d: i for i, d in enumerate(districts)}
+        c_index = {c: i for i, c in enumerate(commodities)}
+
+        keys = list(series)
+        lengths = np.array([len(series[key]) for key in keys], dtype=np.int32)
+        offsets = np.zeros(len(keys), dtype=np.int64)
+        if len(keys):
+            offsets[1:] = np.cumsum(lengths, dtype=np.int64)[:-1]
+
+        values = np.empty(int(lengths.sum()), dtype=np.float32)
+        for key, start, length in zip(keys, offsets, lengths):
+            values[start:start + length] = series[key]
+
+        key_meta = [meta.get(key, (0, 0, 0)) for key in keys]
+        return cls(
+            values, districts, commodities,
+            np.array([d_index[d] for d, _ in keys], dtype=np.int32),
+            np.array([c_index[c] for _, c in keys], dtype=np.int32),
+            offsets, lengths,
+            np.array([m[0] for m in key_meta], dtype=np.int32),
+            np.array([m[1] for m in key_meta], dtype=np.int16),
+            np.array([m[2] for m in key_meta], dtype=np.int32),
+        )
+
+    @classmethod
+    def load(cls, name, directory=MODELS_DIR, generation=0, mmap=True):
+        values_path, index_path = store_paths(name, directory, generation)
+        values = np.load(values_path, mmap_mode="r" if mmap else None)
+        with np.load(index_path, allow_pickle=False) as index:
+            optional = {
+                field: index[field] for field in ("last_dates", "month_days", "generations")
+                if field in index.files
+            }
+            return cls(
+                values,
+                index["districts"].tolist(), index["commodities"].tolist(),
+                index["district_ids"], index["commodity_ids"],
+                index["offsets"], index["lengths"],
+                **optional
+            )
+
+    def save(self, name, directory=MODELS_DIR, generation=0):
+        """Write values then index, each atomically."""
+        values_path, index_path = store_paths(name, directory, generation)
+
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".npy.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.values, dtype=np.float32))
+        os.replace(tmp, values_path)
+
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                districts=np.array(self.districts, dtype=str),
+                commodities=np.array(self.commodities, dtype=str),
+                district_ids=self.district_ids, commodity_ids=self.commodity_ids,
+                offsets=self.offsets, lengths=self.lengths,
+                last_dates=self.last_dates, month_days=self.month_days,
+                generations=self.generations
+            )
+        os.replace(tmp, index_path)
+        return values_path, index_path
+
+
+# ==========================================================
+# MANIFEST
+# ==========================================================
+def read_manifest(directory=MODELS_DIR):
+    """Current manifest, or None when the store has not been converted."""
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_manifest(manifest, directory=MODELS_DIR):
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(directory, MANIFEST))
+
+
+def available(directory=MODELS_DIR):
+    return read_manifest(directory) is not None
+
+
+def load_current(directory=MODELS_DIR):
+    """Return (recent_daily, recent_monthly, manifest) for the current generation."""
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No {MANIFEST} in {directory}; run `history_store convert`")
+    generation = manifest["generation"]
+    return (PriceSeries.load("recent_history", directory, generation),
+            PriceSeries.load("recent_monthly", directory, generation),
+            manifest)
+
+
+def convert(directory=MODELS_DIR, as_of=None):
+    """
+    Write generation 0 from the pickles. `as_of` (a date) records the last
+    observed day of every series, so ingest.py knows where they end.
+    """
+    import joblib
+
+    digest = hashlib.sha256()
+    last = as_of.toordinal() if as_of else 0
+    for name, pickle_name in STORES.items():
+        path = os.path.join(directory, pickle_name)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+
+        data = joblib.load(path)
+        series = PriceSeries.from_dict(data, {key: (last, 0, 0) for key in data})
+        values_path, _ = series.save(name, directory)
+        print(f"   {pickle_name} -> {os.path.basename(values_path)}: "
+              f"{len(series)} series, {series.values.size} values, "
+              f"{series.values.nbytes / 1e6:.1f} MB")
+
+    write_manifest({
+        "base": digest.hexdigest()[:16],
+        "generation": 0,
+        "changed": 0,
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+    }, directory)
+
+
+_PROBE = """
+import os, resource, sys, time
+start = time.perf_counter()
+fmt, directory = sys.argv[1:3]
+if fmt == "pickle":
+    import joblib
+    daily = joblib.load(os.path.join(directory, "recent_history.pkl"))
+    monthly = joblib.load(os.path.join(directory, "recent_monthly.pkl"))
+else:
+    from backend.price_predictor.history_store import load_current
+    daily, monthly, _ = load_current(directory)
+load_s = time.perf_counter() - start
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(f"{load_s:.3f} {rss_mb:.0f} {len(daily)}")
+"""
+
+
+def measure(directory=MODELS_DIR):
+    scripts_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    print(f"{'format':<8}{'load s':>9}{'peak RSS MB':>13}{'series':>9}")
+    for fmt in ("pickle", "mmap"):
+        load_s, rss_mb, count = subprocess.run(
+            [sys.executable, "-c", _PROBE, fmt, directory],
+            capture_output=True, text=True, cwd=scripts_dir, check=True
+        ).stdout.split()[-3:]
+        print(f"{fmt:<8}{load_s:>9}{rss_mb:>13}{count:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory-mapped price history store")
+    parser.add_argument("command", choices=["convert", "measure"])
+    parser.add_argument("--dir", default=MODELS_DIR)
+    parser.add_argument("--as-of", type=date.fromisoformat,
+                        help="convert: last day covered by the pickles (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        convert(args.dir, args.as_of)
+        print(f"✅ Price history stores written to {args.dir}")
+    else:
+        measure(args.dir)
+
+
+if __name__ == "__main__":
+    main()
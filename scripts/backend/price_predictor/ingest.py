@@ -0,0 +1,206 @@
+"""
+Append a day's mandi prices to the memory-mapped price history.
+
+Reads (date, district, commodity, price) records from a CSV and writes the
+next generation of the history store (history_store.py):
+
+- records on or before a series' last observed date are skipped, so
+  re-running an ingest is harmless
+- several records for one key and day (different mandis) are averaged
+- each new daily price is appended and the oldest one dropped, so the
+  series keeps its length (growing until it reaches LOOKBACK days)
+- the monthly series gets a running mean for the current month, or a new
+  value when the month changes
+- unseen keys start new series
+
+Only the changed series get a new generation number. Running workers
+notice the new manifest (app.refresh_history) and swap the history in
+without a restart, dropping cached forecasts for the changed keys only;
+with --db their stored forecasts are deleted as well.
+
+Needs a store converted with `history_store convert --as-of <last day>`.
+
+    cd scripts
+    python -m backend.price_predictor.ingest prices_2026-01-21.csv --db
+"""
+import argparse
+import csv
+import glob
+import os
+import re
+import time
+from collections import defaultdict
+from datetime import date, datetime
+
+from backend.price_predictor import history_store
+from backend.price_predictor.history_store import MODELS_DIR, PriceSeries
+
+LOOKBACK = 60
+KEEP_GENERATIONS = 2
+
+
+def read_records(path):
+    """{(district, commodity): {date ordinal: [prices]}} from a CSV file."""
+    records = defaultdict(lambda: defaultdict(list))
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        missing = {"date", "district", "commodity", "price"} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"{path}: missing columns {', '.join(sorted(missing))}")
+
+        for line, row in enumerate(reader, start=2):
+            try:
+                day = date.fromisoformat(row["date"].strip()).toordinal()
+                price = float(row["price"])
+            except ValueError as e:
+                raise ValueError(f"{path}:{line}: {e}") from e
+            if price <= 0:
+                continue
+            key = (row["district"].strip().title(), row["commodity"].strip().title())
+            records[key][day].append(price)
+    return records
+
+
+def _same_month(a, b):
+    a, b = date.fromordinal(a), date.fromordinal(b)
+    return (a.year, a.month) == (b.year, b.month)
+
+
+def apply(daily, monthly, records, generation):
+    """
+    Merge `records` into copies of the changed series.
+    Returns ({key: prices}, {key: meta}) for both stores and the changed keys.
+    """
+    new_daily, new_monthly = {}, {}
+    daily_meta, monthly_meta = {}, {}
+    changed = []
+
+    for key, days in records.items():
+        if key in daily:
+            prices = [float(p) for p in daily[key]]
+            last, _, _ = daily.meta(key)
+        else:
+            prices, last = [], 0
+        if key in monthly:
+            months = [float(p) for p in monthly[key]]
+            month_last, month_days, _ = monthly.meta(key)
+        else:
+            months, month_last, month_days = [], 0, 0
+        keep = max(len(prices), LOOKBACK)
+        keep_months = max(len(months), 3)
+
+        added = 0
+        for day in sorted(days):
+            if day <= last:
+                continue
+            price = sum(days[day]) / len(days[day])
+            prices.append(price)
+
+            if months and month_last and _same_month(day, month_last):
+                # Converted series do not record how many days went into
+                # their last month; assume one per day up to the as-of date
+                count = month_days or date.fromordinal(month_last).day
+                months[-1] = (months[-1] * count + price) / (count + 1)
+                month_days = count + 1
+            else:
+                months.append(price)
+                month_days = 1
+            last = month_last = day
+            added += 1
+
+        if not added:
+            continue
+        new_daily[key] = prices[-keep:]
+        new_monthly[key] = months[-keep_months:]
+        daily_meta[key] = (last, 0, generation)
+        monthly_meta[key] = (month_last, month_days, generation)
+        changed.append(key)
+
+    return (new_daily, daily_meta), (new_monthly, monthly_meta), changed
+
+
+def _merge(series, updates, meta):
+    """All series of `series` with `updates` applied, plus their metadata."""
+    merged = {key: series[key] for key in series}
+    merged_meta = {key: series.meta(key) for key in series}
+    merged.update(updates)
+    merged_meta.update(meta)
+    return PriceSeries.from_dict(merged, merged_meta)
+
+
+def remove_old_generations(generation, directory=MODELS_DIR):
+    """Delete store files more than KEEP_GENERATIONS generations old."""
+    removed = 0
+    for name in history_store.STORES:
+        for path in glob.glob(os.path.join(directory, f"{name}_*.np[yz]")):
+            match = re.search(r"\.g(\d+)\.np[yz]$", path)
+            old = int(match.group(1)) if match else 0
+            if old <= generation - KEEP_GENERATIONS:
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+def ingest(paths, directory=MODELS_DIR):
+    """Write the next generation from the CSV files; returns (manifest, changed keys)."""
+    daily, monthly, manifest = history_store.load_current(directory)
+
+    records = defaultdict(lambda: defaultdict(list))
+    for path in paths:
+        for key, days in read_records(path).items():
+            for day, prices in days.items():
+                records[key][day].extend(prices)
+
+    generation = manifest["generation"] + 1
+    (d_updates, d_meta), (m_updates, m_meta), changed = apply(daily, monthly, records, generation)
+    if not changed:
+        return manifest, []
+
+    _merge(daily, d_updates, d_meta).save("recent_history", directory, generation)
+    _merge(monthly, m_updates, m_meta).save("recent_monthly", directory, generation)
+
+    manifest = {
+        **manifest,
+        "generation": generation,
+        "changed": len(changed),
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    # Workers switch over when the manifest is replaced
+    history_store.write_manifest(manifest, directory)
+    remove_old_generations(generation, directory)
+    return manifest, changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append daily prices to the price history store")
+    parser.add_argument("paths", nargs="+", help="CSV files with date,district,commodity,price")
+    parser.add_argument("--dir", default=MODELS_DIR)
+    parser.add_argument("--db", nargs="?", const="", default=None,
+                        help="also delete stored forecasts of the changed keys "
+                             "(optionally the database path)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest, changed = ingest(args.paths, args.dir)
+    if not changed:
+        print("Nothing new to ingest")
+        return
+
+    if args.db is not None:
+        from backend.database.db import DB_PATH, connect
+        from backend.database.migrations import migrate
+        from backend.price_predictor.store import drop_keys
+
+        conn = connect(args.db or DB_PATH)
+        migrate(conn)
+        with conn:
+            dropped = drop_keys(conn, changed)
+        conn.close()
+        print(f"   {dropped} stored forecasts dropped")
+
+    print(f"✅ Generation {manifest['generation']}: {len(changed)} series updated "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Pure NumPy inference for the global price LSTM.
+
+The Keras model is a small stack of LSTM and Dense layers, so running it
+needs a few matrix products per time step, not the TensorFlow runtime.
+export_lstm.py writes the trained weights and layer configuration to
+global_lstm.npz; NumpyLSTMModel loads that file and offers the same
+`predict(X, verbose=0, batch_size=None)` call that forecast_short_term()
+uses on the Keras model.
+
+Select it with PRICE_LSTM_BACKEND=numpy.
+"""
+import json
+
+import numpy as np
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _hard_sigmoid(x):
+    # Keras 2 definition
+    return np.clip(0.2 * x + 0.5, 0.0, 1.0)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "hard_sigmoid": _hard_sigmoid,
+    "relu": lambda x: np.maximum(x, 0.0),
+}
+
+
+class NumpyLSTMModel:
+    def __init__(self, layers):
+        """`layers`: list of (config dict, [weight arrays]) in model order."""
+        self.layers = []
+        for config, weights in layers:
+            for key in ("activation", "recurrent_activation"):
+                if key in config and config[key] not in ACTIVATIONS:
+                    raise ValueError(f"Unsupported activation: {config[key]}")
+            self.layers.append((config, [np.asarray(w, dtype=np.float32) for w in weights]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            configs = json.loads(str(data["config"]))
+            layers = [
+                (config, [data[f"layer{i}_w{j}"] for j in range(config["n_weights"])])
+                for i, config in enumerate(configs)
+            ]
+        return cls(layers)
+
+    def predict(self, X, verbose=0, batch_size=None):
+        X = np.asarray(X, dtype=np.float32)
+        if not batch_size or len(X) <= batch_size:
+            return self._forward(X)
+        return np.concatenate([
+            self._forward(X[i:i + batch_size]) for i in range(0, len(X), batch_size)
+        ])
+
+    # ------------------------------------------------------------------
+    def _forward(self, x):
+        for config, weights in self.layers:
+            if config["type"] == "LSTM":
+                x = self._lstm(x, config, weights)
+            elif config["type"] == "Dense":
+                x = ACTIVATIONS[config["activation"]](
+                    x @ weights[0] + (weights[1] if len(weights) > 1 else 0.0)
+                )
+            else:
+                raise ValueError(f"Unsupported layer: {config['type']}")
+        return x
+
+    @staticmethod
+    def _lstm(x, config, weights):
+        kernel, recurrent = weights[0], weights[1]
+        bias = weights[2] if len(weights) > 2 else np.zeros(kernel.shape[1], dtype=np.float32)
+        units = recurrent.shape[0]
+        act = ACTIVATIONS[config["activation"]]
+        rec_act = ACTIVATIONS[config["recurrent_activation"]]
+
+        batch, steps, _ = x.shape
+        # Input projections for every time step in one product
+        projected = x @ kernel + bias
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        outputs = np.empty((batch, steps, units), dtype=np.float32) \
+            if config["return_sequences"] else None
+
+        # Keras gate order: input, forget, cell, output
+        for t in range(steps):
+            z = projected[:, t] + h @ recurrent
+            i = rec_act(z[:, :units])
+            f = rec_act(z[:, units:2 * units])
+            g = act(z[:, 2 * units:3 * units])
+            o = rec_act(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * act(c)
+            if outputs is not None:
+                outputs[:, t] = h
+
+        return outputs if outputs is not None else h
@@ -0,0 +1,68 @@
+"""
+Precompute price forecasts for every (district, commodity) key.
+
+Runs predict_batch() over all keys of recent_daily and writes the responses
+to the price_forecasts table, stamped with the artifacts' data version (plus
+each key's history generation, see store.py), then drops rows from older
+versions, all in one transaction. /predict then serves those keys with a
+primary-key lookup. Schedule it after every artifact refresh or daily
+ingest, e.g. nightly:
+
+    cd scripts
+    python -m backend.price_predictor.precompute
+
+    # crontab
+    30 2 * * *  cd /srv/agriverse/scripts && python -m backend.price_predictor.precompute
+"""
+import argparse
+import time
+
+from backend.database.db import DB_PATH, connect
+from backend.database.migrations import migrate
+from backend.price_predictor import app as pp
+from backend.price_predictor.store import save_forecasts, drop_stale, record_run
+
+
+def precompute(chunk_size=2000):
+    """Forecast every key; returns ([(key, version, result)], failed key count)."""
+    keys = list(pp.recent_daily)
+    items, failed = [], 0
+
+    for i in range(0, len(keys), chunk_size):
+        chunk = keys[i:i + chunk_size]
+        for key, result in zip(chunk, pp.predict_batch(chunk)):
+            if "error" in result:
+                failed += 1
+            else:
+                key = pp.normalize_key(*key)
+                items.append((key, pp.key_version(key), result))
+        print(f"   … {min(i + chunk_size, len(keys))}/{len(keys)} keys")
+
+    return items, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute price forecasts for every key")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    migrate(conn)
+
+    start = time.perf_counter()
+    items, failed = precompute(args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    with conn:
+        save_forecasts(conn, items)
+        dropped = drop_stale(conn, pp.DATA_VERSION)
+        record_run(conn, pp.DATA_VERSION, len(items), failed, round(elapsed, 2))
+    conn.close()
+
+    print(f"✅ Stored {len(items)} forecasts (data version {pp.DATA_VERSION}) "
+          f"in {elapsed:.1f}s; {failed} keys skipped, {dropped} stale rows dropped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Precomputed price forecasts (price_forecasts table, migration 6).
+
+Each row holds the full predict() response for one (district, commodity),
+stamped with the data_version of the model and history artifacts it was
+computed from. A row whose stamp differs from the loaded artifacts is stale
+and ignored, so swapping artifacts never serves old forecasts.
+
+With the memory-mapped history the stamp is per key,
+"<artifacts version>.g<generation>" (app.key_version), so a daily ingest
+only makes the rows of the keys it changed stale.
+"""
+import json
+
+GET_FORECAST_SQL = """
+    SELECT result
+    FROM price_forecasts
+    WHERE district = ? AND commodity = ? AND data_version = ?
+"""
+
+
+def get_forecast(conn, key, data_version):
+    """Stored result for `key` computed from `data_version`, else None."""
+    row = conn.execute(GET_FORECAST_SQL, (key[0], key[1], data_version)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def save_forecasts(conn, items):
+    """Upsert [((district, commodity), data_version, result)] (caller commits)."""
+    conn.executemany("""
+        INSERT INTO price_forecasts (district, commodity, data_version, result)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(district, commodity) DO UPDATE SET
+            data_version = excluded.data_version,
+            result = excluded.result,
+            computed_at = CURRENT_TIMESTAMP
+    """, [
+        (district, commodity, data_version, json.dumps(result))
+        for (district, commodity), data_version, result in items
+    ])
+
+
+def record_run(conn, data_version, keys, failed, seconds):
+    conn.execute("""
+        INSERT INTO price_forecast_runs (data_version, keys, failed, seconds)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(data_version) DO UPDATE SET
+            keys = excluded.keys,
+            failed = excluded.failed,
+            seconds = excluded.seconds,
+            computed_at = CURRENT_TIMESTAMP
+    """, (data_version, keys, failed, seconds))
+
+
+def drop_stale(conn, data_version):
+    """Delete rows from other artifact versions; returns how many."""
+    return conn.execute("""
+        DELETE FROM price_forecasts
+        WHERE data_version != ? AND substr(data_version, 1, ?) != ?
+    """, (data_version, len(data_version) + 2, data_version + ".g")).rowcount
+
+
+def drop_keys(conn, keys):
+    """Delete the rows of [(district, commodity)]; returns how many."""
+    return conn.executemany(
+        "DELETE FROM price_forecasts WHERE district = ? AND commodity = ?", keys
+    ).rowcount
+
+
+def latest_run(conn):
+    row = conn.execute("""
+        SELECT data_version, keys, failed, seconds, computed_at
+        FROM price_forecast_runs
+        ORDER BY computed_at DESC
+        LIMIT 1
+    """).fetchone()
+    return dict(row) if row else None
@@ -1,4 +1,3 @@
-import requests
 import numpy as np
 import torch
 import feedparser
@@ -8,6 +7,8 @@ from datetime import datetime, timedelta
 from html import unescape
 from functools import lru_cache
 
+from backend import http_client
+
 # =====================================================
 # CONFIG
 # =====================================================
@@ -99,7 +100,7 @@ def fetch_gnews(crop):
         "apikey": GNEWS_API_KEY
     }
 
-    r = requests.get("https://gnews.io/api/v4/search", params=params, timeout=10)
+    r = http_client.get("https://gnews.io/api/v4/search", params=params)
     articles = r.json().get("articles", [])
 
     items, texts = [], []
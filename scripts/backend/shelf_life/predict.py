@@ -1,8 +1,21 @@
 import joblib
-import requests
-from datetime import datetime, date
+import os
+from datetime import datetime
 import sys
-import numpy as np
+
+try:
+    from backend.weather import provider
+except ImportError:
+    # Run as a script from this folder: make scripts/ importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    from backend.weather import provider
+
+# No current-conditions source: today is treated like a future date
+weather = provider.WeatherProvider(sources=(
+    provider.NasaPowerSource(),
+    provider.ClimatologyTableSource(),
+    provider.ClimatologySource(),
+))
 
 # --------------------------------------------------
 # DISTRICT → COORDINATES
@@ -35,60 +48,10 @@ except FileNotFoundError:
 # --------------------------------------------------
 
 def get_climate(lat, lon, target_date):
-    today = date.today()
-    day_of_year = target_date.timetuple().tm_yday
-
-    # 🔹 CASE 1: Past dates → fetch exact data
-    if target_date.date() < today:
-        return fetch_daily_nasa(lat, lon, target_date)
-
-    # 🔹 CASE 2: Today or future → use climatology
-    return fetch_climatology(lat, lon, day_of_year)
-
-
-def fetch_daily_nasa(lat, lon, target_date):
-    date_str = target_date.strftime("%Y%m%d")
-
-    url = (
-        "https://power.larc.nasa.gov/api/temporal/daily/point"
-        f"?parameters=T2M,RH2M"
-        f"&start={date_str}&end={date_str}"
-        f"&latitude={lat}&longitude={lon}"
-        "&community=AG&format=JSON"
-    )
-
-    r = requests.get(url, timeout=10).json()
-
-    if "properties" not in r:
-        raise ValueError("❌ No historical weather data available.")
-
-    params = r["properties"]["parameter"]
-    return params["RH2M"][date_str], params["T2M"][date_str]
-
-
-def fetch_climatology(lat, lon, day_of_year):
-    # Last 10 years climatology
-    start_year = date.today().year - 10
-    values_h, values_t = [], []
-
-    for y in range(start_year, start_year + 10):
-        d = datetime.strptime(f"{y}-01-01", "%Y-%m-%d") \
-            .replace(tzinfo=None) \
-            .timetuple()
-        target = datetime(y, 1, 1) + \
-            (datetime.strptime("2000-01-02", "%Y-%m-%d") - datetime.strptime("2000-01-01", "%Y-%m-%d")) * (day_of_year - 1)
-
-        try:
-            h, t = fetch_daily_nasa(lat, lon, target)
-            values_h.append(h)
-            values_t.append(t)
-        except:
-            continue
-
-    if not values_h:
-        raise ValueError("❌ Unable to compute climatology.")
-
-    return np.mean(values_h), np.mean(values_t)
+    # Past dates -> observed NASA POWER data, today or future -> climatology
+    # (see backend/weather/provider.py)
+    reading = weather.conditions(lat, lon, target_date.date(), fallback=False)
+    return reading.humidity, reading.temperature
 
 # --------------------------------------------------
 # PREDICTION
@@ -2,7 +2,15 @@ from fastapi import FastAPI
 from pydantic import BaseModel, Field
 from enum import Enum
 import pandas as pd
-import requests
+import os
+import sys
+
+try:
+    from backend import http_client
+except ImportError:
+    # Served from this folder (uvicorn farmer_api:app): make scripts/ importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+    from backend import http_client
 
 # Import map generator
 from farmer_map import generate_farmer_map
@@ -124,13 +132,14 @@ def farmer_redistribution(data: FarmerInput):
     )
 
     # ------------------ SHELF LIFE API ------------------
-    shelf_response = requests.post(
+    shelf_response = http_client.post(
         "http://127.0.0.1:8000/predict",
         json={
             "temperature": 32,   # can be auto-fetched later
             "humidity": 75,
             "grain": data.grain.value
-        }
+        },
+        retries=1   # prediction only, safe to repeat
     ).json()
 
     send_amount = min(produce, target["Deficit_tons"])
@@ -0,0 +1,164 @@
+"""
+Local archive of observed daily weather (NASA POWER T2M / RH2M).
+
+One small .npy file per location and year, shape (366, variable), float32,
+NaN where NASA has no data yet; days use the same leap-year slots as
+backend/weather/climatology.py. The first lookup for a year fetches the
+whole year in one request and writes the file; every later lookup for that
+year is a read from a memory-mapped array with no network I/O.
+
+The current year is fetched up to yesterday. A missing day in it is
+re-fetched at most once per ARCHIVE_REFETCH_INTERVAL seconds, since NASA
+publishes with a few days' lag.
+
+    cd scripts
+    python -m backend.weather.archive warm 2015 2024    # every district
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from backend.districts import KARNATAKA_DISTRICTS
+from backend.weather import nasa_power
+from backend.weather.cache import coord_key
+from backend.weather.climatology import CLIMATOLOGY_DIR, DAYS, VARIABLES, day_index
+
+WEATHER_ARCHIVE_DIR = os.environ.get(
+    "WEATHER_ARCHIVE_DIR", os.path.join(CLIMATOLOGY_DIR, "archive")
+)
+ARCHIVE_REFETCH_INTERVAL = float(os.environ.get("ARCHIVE_REFETCH_INTERVAL", 6 * 3600))
+
+
+class HistoryArchive:
+    def __init__(self, directory=WEATHER_ARCHIVE_DIR, fetch=nasa_power.fetch_daily):
+        self.directory = directory
+        self.fetch = fetch
+
+        self._arrays = {}        # path -> (mtime, memmap)
+        self._path_locks = {}
+        self._lock = threading.Lock()
+        self._stats = {"reads": 0, "year_fetches": 0, "fetch_errors": 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def observed(self, lat, lon, day):
+        """{"T2M": ..., "RH2M": ...} for a past day, or None if NASA has no data."""
+        lat, lon = coord_key(lat, lon)
+        path = self._path(lat, lon, day.year)
+        slot = day_index(day)
+
+        array = self._open(path)
+        if array is None or (np.isnan(array[slot]).any() and self._may_refetch(path, day)):
+            with self._path_lock(path):
+                # Another thread may have fetched this year meanwhile
+                array = self._open(path)
+                if array is None or (np.isnan(array[slot]).any() and self._may_refetch(path, day)):
+                    self._fetch_year(lat, lon, day.year, path)
+                    array = self._open(path)
+
+        self._count("reads")
+        row = array[slot]
+        if np.isnan(row).any():
+            return None
+        return {variable: float(row[v]) for v, variable in enumerate(VARIABLES)}
+
+    def warm(self, locations, years):
+        """Fetch every missing (location, year) file."""
+        fetched = 0
+        for lat, lon in locations:
+            lat, lon = coord_key(lat, lon)
+            for year in years:
+                path = self._path(lat, lon, year)
+                if not os.path.exists(path):
+                    with self._path_lock(path):
+                        self._fetch_year(lat, lon, year, path)
+                    fetched += 1
+        return fetched
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["open_files"] = len(self._arrays)
+        return stats
+
+    # ------------------------------------------------------------------
+    def _path(self, lat, lon, year):
+        return os.path.join(self.directory, f"{lat}_{lon}_{year}.npy")
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _path_lock(self, path):
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def _open(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._arrays.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        array = np.load(path, mmap_mode="r")
+        with self._lock:
+            self._arrays[path] = (mtime, array)
+        return array
+
+    def _may_refetch(self, path, day):
+        """Only days NASA may still publish are worth another request."""
+        if day >= date.today() or day.year < date.today().year - 1:
+            return False
+        try:
+            return time.time() - os.stat(path).st_mtime > ARCHIVE_REFETCH_INTERVAL
+        except OSError:
+            return True
+
+    def _fetch_year(self, lat, lon, year, path):
+        end = min(date(year, 12, 31), date.today() - timedelta(days=1))
+        self._count("year_fetches")
+        try:
+            days = self.fetch(lat, lon, date(year, 1, 1), end)
+        except Exception:
+            self._count("fetch_errors")
+            raise
+
+        array = np.full((DAYS, len(VARIABLES)), np.nan, dtype=np.float32)
+        for stamp, values in days.items():
+            slot = day_index(date.fromisoformat(stamp))
+            for v, variable in enumerate(VARIABLES):
+                if variable in values:
+                    array[slot, v] = values[variable]
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".npy.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local NASA POWER history archive")
+    parser.add_argument("--dir", default=WEATHER_ARCHIVE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("warm", help="fetch whole years for every district")
+    warm.add_argument("first_year", type=int)
+    warm.add_argument("last_year", type=int)
+    args = parser.parse_args()
+
+    archive = HistoryArchive(args.dir)
+    locations = [(c["lat"], c["lon"]) for c in KARNATAKA_DISTRICTS.values()]
+    start = time.perf_counter()
+    fetched = archive.warm(locations, range(args.first_year, args.last_year + 1))
+    print(f"✅ Fetched {fetched} location-years in {time.perf_counter() - start:.1f}s "
+          f"into {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
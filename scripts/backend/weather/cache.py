@@ -0,0 +1,181 @@
+"""
+Two-tier weather cache keyed by coordinates.
+
+Farmer coordinates are always one of the KARNATAKA_DISTRICTS centroids, so
+keying on rounded (lat, lon) makes every farmer of a district share one
+upstream fetch.
+
+- fresh   (age < ttl):        served from memory
+- stale   (age < stale_ttl):  served immediately, refreshed in the background
+- expired / missing:          fetched synchronously; concurrent requests for
+                              the same key wait on a single upstream call
+
+Entries are also written to an on-disk tier (one JSON file per key), so a
+restarted worker or a sibling worker on the same host starts warm.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+WEATHER_CACHE_TTL = float(os.environ.get("WEATHER_CACHE_TTL", 600))
+WEATHER_CACHE_STALE_TTL = float(os.environ.get("WEATHER_CACHE_STALE_TTL", 6 * 3600))
+WEATHER_CACHE_DIR = os.environ.get(
+    "WEATHER_CACHE_DIR", os.path.join(tempfile.gettempdir(), "agriverse-weather")
+)
+
+
+def coord_key(lat, lon):
+    return (round(float(lat), 4), round(float(lon), 4))
+
+
+class WeatherCache:
+    def __init__(self, ttl=WEATHER_CACHE_TTL, stale_ttl=WEATHER_CACHE_STALE_TTL,
+                 disk_dir=WEATHER_CACHE_DIR, namespace="forecast"):
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.disk_dir = disk_dir
+        self.namespace = namespace
+
+        self._entries = {}        # key -> (fetched_at, value)
+        self._key_locks = {}      # key -> Lock, for single-flight fetches
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "hits": 0, "stale_hits": 0, "disk_hits": 0, "misses": 0,
+            "upstream_calls": 0, "upstream_errors": 0,
+        }
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    def get(self, key, fetch, ttl=None, stale_ttl=None):
+        """
+        Return the cached value for `key`, calling `fetch()` when needed.
+        `fetch` must raise on failure; errors are never cached.
+        `ttl` / `stale_ttl` override the cache-wide values for this key
+        (e.g. historical observations, which never change).
+        """
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = max(self.stale_ttl if stale_ttl is None else stale_ttl, ttl)
+        entry = self._lookup(key)
+        now = time.time()
+
+        if entry:
+            fetched_at, value = entry
+            age = now - fetched_at
+            if age < ttl:
+                self._count("hits")
+                return value
+            if age < stale_ttl:
+                self._count("stale_hits")
+                self._refresh_in_background(key, fetch)
+                return value
+
+        with self._key_lock(key):
+            # Another thread may have fetched while we waited
+            entry = self._lookup(key)
+            if entry and time.time() - entry[0] < ttl:
+                self._count("hits")
+                return entry[1]
+            self._count("misses")
+            try:
+                return self._fetch(key, fetch)
+            except Exception:
+                # Upstream down: an expired copy beats no data at all
+                if entry:
+                    return entry[1]
+                raise
+
+    def put(self, key, value, fetched_at=None):
+        fetched_at = fetched_at or time.time()
+        with self._lock:
+            self._entries[key] = (fetched_at, value)
+        self._write_disk(key, fetched_at, value)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        served = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["stale_hits"]) / served, 3) if served else 0
+        return stats
+
+    # ------------------------------------------------------------------
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = self._read_disk(key)
+            if entry:
+                self._count("disk_hits")
+                with self._lock:
+                    self._entries[key] = entry
+        return entry
+
+    def _fetch(self, key, fetch):
+        self._count("upstream_calls")
+        try:
+            value = fetch()
+        except Exception:
+            self._count("upstream_errors")
+            raise
+        self.put(key, value)
+        return value
+
+    def _refresh_in_background(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                with self._key_lock(key):
+                    self._fetch(key, fetch)
+            except Exception as e:
+                print(f"WARNING: Background weather refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    # ------------------------------------------------------------------
+    # on-disk tier
+    # ------------------------------------------------------------------
+    def _disk_path(self, key):
+        name = f"{self.namespace}_{'_'.join(str(k) for k in key)}.json"
+        return os.path.join(self.disk_dir, name)
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                data = json.load(f)
+            return data["fetched_at"], data["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key, fetched_at, value):
+        if not self.disk_dir:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": fetched_at, "value": value}, f)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError as e:
+            print(f"WARNING: Could not write weather cache file: {e}")
@@ -0,0 +1,282 @@
+"""
+Precomputed day-of-year climatology per district.
+
+Averaging the same date over past years used to cost one NASA POWER request
+per year and per prediction. Instead, `refresh` pulls each district's full
+multi-year daily range in a single request, averages it per calendar day and
+saves one float32 array:
+
+    climatology.<stamp>.npy  shape (district, 366, variable), NaN where unknown
+    climatology.json         district names + centroids, variables, years, and
+                             the name of the array file it describes
+
+Lookups memory-map the array and read one cell, so they cost no network I/O
+and almost no memory. Calendar days are indexed on a leap-year calendar
+(1 Jan = 0, 29 Feb = 59, 31 Dec = 365), so a date maps to the same slot in
+every year.
+
+    cd scripts
+    python -m backend.weather.climatology refresh --years 10
+    python -m backend.weather.climatology show Mandya 2025-11-20
+    python -m backend.weather.climatology fixture    # synthetic, offline
+
+The fixture writes deterministic seasonal curves without touching the
+network, for development and tests.
+
+`save` writes a new array file and then replaces climatology.json, so the
+metadata and the array it points at always switch over together.
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+import numpy as np
+
+from backend.districts import KARNATAKA_DISTRICTS
+from backend.weather import nasa_power
+from backend.weather.cache import coord_key
+
+CLIMATOLOGY_DIR = os.environ.get(
+    "CLIMATOLOGY_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+)
+VARIABLES = ("T2M", "RH2M")
+DAYS = 366
+
+# Farther than this from every centroid (degrees) is "not a district"
+MAX_CENTROID_DISTANCE = 0.5
+
+
+def day_index(day):
+    """Slot of a calendar day on a leap-year calendar (0..365)."""
+    return date(2000, day.month, day.day).toordinal() - date(2000, 1, 1).toordinal()
+
+
+def _meta_path(directory):
+    return os.path.join(directory, "climatology.json")
+
+
+def _array_path(directory, meta):
+    # Tables written before the array name was recorded in the metadata
+    return os.path.join(directory, meta.get("array", "climatology.npy"))
+
+
+# ==========================================================
+# BUILD
+# ==========================================================
+def build(districts=None, start_year=None, end_year=None, fetch=nasa_power.fetch_daily):
+    """
+    Return (array, meta) averaging `start_year`..`end_year` (inclusive,
+    default the last 10 complete years) for each district.
+    """
+    districts = districts or KARNATAKA_DISTRICTS
+    end_year = end_year or date.today().year - 1
+    start_year = start_year or end_year - 9
+
+    names = list(districts)
+    sums = np.zeros((len(names), DAYS, len(VARIABLES)), dtype=np.float64)
+    counts = np.zeros((len(names), DAYS, len(VARIABLES)), dtype=np.int32)
+
+    for i, name in enumerate(names):
+        lat, lon = coord_key(districts[name]["lat"], districts[name]["lon"])
+        start = time.perf_counter()
+        days = fetch(lat, lon, date(start_year, 1, 1), date(end_year, 12, 31))
+        for stamp, values in days.items():
+            slot = day_index(date.fromisoformat(stamp))
+            for v, variable in enumerate(VARIABLES):
+                if variable in values:
+                    sums[i, slot, v] += values[variable]
+                    counts[i, slot, v] += 1
+        print(f"   {name}: {len(days)} days in {time.perf_counter() - start:.1f}s")
+
+    with np.errstate(invalid="ignore"):
+        array = (sums / counts).astype(np.float32)
+
+    # 29 February has a quarter of the samples, or none for short ranges
+    feb29 = day_index(date(2000, 2, 29))
+    missing = np.isnan(array[:, feb29, :])
+    array[:, feb29, :][missing] = ((array[:, feb29 - 1, :] + array[:, feb29 + 1, :]) / 2)[missing]
+
+    meta = {
+        "districts": [
+            {"name": name, "lat": districts[name]["lat"], "lon": districts[name]["lon"]}
+            for name in names
+        ],
+        "variables": list(VARIABLES),
+        "years": [start_year, end_year],
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    return array, meta
+
+
+def build_fixture(districts=None):
+    """Deterministic synthetic climatology (no network): smooth seasonal curves."""
+    districts = districts or KARNATAKA_DISTRICTS
+    names = list(districts)
+    slots = np.arange(DAYS)
+    season = np.cos(2 * math.pi * (slots - 120) / DAYS)     # warmest around 1 May
+
+    array = np.empty((len(names), DAYS, len(VARIABLES)), dtype=np.float32)
+    for i, name in enumerate(names):
+        lat = districts[name]["lat"]
+        array[i, :, 0] = 26.0 + (15.0 - lat) * 0.3 + 3.5 * season
+        array[i, :, 1] = 68.0 - 12.0 * season
+    meta = {
+        "districts": [
+            {"name": name, "lat": districts[name]["lat"], "lon": districts[name]["lon"]}
+            for name in names
+        ],
+        "variables": list(VARIABLES),
+        "years": None,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "fixture": True,
+    }
+    return array, meta
+
+
+def save(array, meta, directory=CLIMATOLOGY_DIR):
+    """
+    Write the array under a new name, then atomically replace the metadata
+    that names it. Readers go through the metadata, so they see either the
+    old pair or the new one, never a mix.
+    """
+    os.makedirs(directory, exist_ok=True)
+    meta_path = _meta_path(directory)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            previous = json.load(f).get("array", "climatology.npy")
+    except FileNotFoundError:
+        previous = None
+
+    name = f"climatology.{time.time_ns()}.npy"
+    array_path = os.path.join(directory, name)
+    with open(array_path, "wb") as f:
+        np.save(f, array)
+
+    fd, tmp_meta = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({**meta, "array": name}, f, indent=2)
+    os.replace(tmp_meta, meta_path)
+
+    # Keep the array just replaced for readers that read the old metadata a
+    # moment ago; anything older is unreferenced
+    for old in glob.glob(os.path.join(directory, "climatology*.npy")):
+        if os.path.basename(old) not in (name, previous):
+            os.remove(old)
+    return array_path
+
+
+# ==========================================================
+# LOOKUP
+# ==========================================================
+class ClimatologyTable:
+    """
+    Memory-mapped climatology. Reopens the files when `refresh` replaces
+    them, so a running server picks up a rebuilt table.
+    """
+
+    def __init__(self, directory=CLIMATOLOGY_DIR):
+        self.directory = directory
+        self._array = None
+        self._meta = None
+        self._by_name = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def available(self):
+        return os.path.exists(_meta_path(self.directory))
+
+    def lookup(self, day, district=None, lat=None, lon=None):
+        """
+        {"T2M": ..., "RH2M": ...} for a calendar day, by district name or by
+        the nearest district centroid. None if unknown.
+        """
+        array, meta, by_name = self._load()
+        if array is None:
+            return None
+
+        index = by_name.get(district) if district else self._nearest(meta, lat, lon)
+        if index is None:
+            return None
+
+        row = array[index, day_index(day)]
+        if np.isnan(row).any():
+            return None
+        return {variable: float(row[v]) for v, variable in enumerate(meta["variables"])}
+
+    def info(self):
+        _, meta, _ = self._load()
+        return meta
+
+    # ------------------------------------------------------------------
+    def _load(self):
+        meta_path = _meta_path(self.directory)
+        try:
+            mtime = os.stat(meta_path).st_mtime_ns
+        except OSError:
+            return None, None, {}
+
+        with self._lock:
+            if mtime != self._mtime:
+                with open(meta_path, encoding="utf-8") as f:
+                    self._meta = json.load(f)
+                self._array = np.load(_array_path(self.directory, self._meta), mmap_mode="r")
+                self._by_name = {
+                    d["name"]: i for i, d in enumerate(self._meta["districts"])
+                }
+                self._mtime = mtime
+            return self._array, self._meta, self._by_name
+
+    @staticmethod
+    def _nearest(meta, lat, lon):
+        if lat is None or lon is None:
+            return None
+        best, best_distance = None, MAX_CENTROID_DISTANCE
+        for i, d in enumerate(meta["districts"]):
+            distance = math.hypot(d["lat"] - float(lat), d["lon"] - float(lon))
+            if distance <= best_distance:
+                best, best_distance = i, distance
+        return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Day-of-year climatology tables")
+    parser.add_argument("--dir", default=CLIMATOLOGY_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    refresh = sub.add_parser("refresh", help="rebuild from NASA POWER (one request per district)")
+    refresh.add_argument("--years", type=int, default=10)
+    refresh.add_argument("--end-year", type=int, default=date.today().year - 1)
+
+    sub.add_parser("fixture", help="write a synthetic table without network access")
+
+    show = sub.add_parser("show", help="print the climatology for a district and date")
+    show.add_argument("district")
+    show.add_argument("date", help="YYYY-MM-DD")
+
+    args = parser.parse_args()
+
+    if args.command == "show":
+        table = ClimatologyTable(args.dir)
+        if not table.available():
+            raise SystemExit(f"No climatology table in {args.dir}; run `refresh` first")
+        values = table.lookup(date.fromisoformat(args.date), district=args.district)
+        print(json.dumps({"district": args.district, "date": args.date, "values": values}))
+        return
+
+    start = time.perf_counter()
+    if args.command == "fixture":
+        array, meta = build_fixture()
+    else:
+        array, meta = build(start_year=args.end_year - args.years + 1, end_year=args.end_year)
+    path = save(array, meta, args.dir)
+    print(f"✅ Wrote {path} {array.shape} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+NASA POWER daily point client (historical observations).
+
+    fetch_daily(lat, lon, date(2023, 1, 1), date(2023, 12, 31))
+    -> {"2023-01-01": {"T2M": 21.4, "RH2M": 71.2}, ...}
+
+A whole range costs one request, the same as a single day. Days NASA has
+not published yet (the last few days before today) come back as the -999
+fill value and are left out of the result.
+
+NASA_POWER_URL can point at a local stub server for testing.
+"""
+import os
+
+from backend import http_client
+
+NASA_POWER_URL = os.environ.get(
+    "NASA_POWER_URL", "https://power.larc.nasa.gov/api/temporal/daily/point"
+)
+PARAMETERS = ("T2M", "RH2M")
+FILL_VALUE = -999
+
+
+def fetch_daily(lat, lon, start, end, parameters=PARAMETERS, url=None):
+    response = http_client.get(url or NASA_POWER_URL, params={
+        "parameters": ",".join(parameters),
+        "start": start.strftime("%Y%m%d"),
+        "end": end.strftime("%Y%m%d"),
+        "latitude": lat,
+        "longitude": lon,
+        "community": "AG",
+        "format": "JSON"
+    })
+    response.raise_for_status()
+    data = response.json()
+
+    if "properties" not in data:
+        raise ValueError("No historical weather data available")
+
+    series = data["properties"]["parameter"]
+    days = {}
+    for name in parameters:
+        for stamp, value in series.get(name, {}).items():
+            if value is None or value <= FILL_VALUE:
+                continue
+            day = f"{stamp[:4]}-{stamp[4:6]}-{stamp[6:8]}"
+            days.setdefault(day, {})[name] = value
+
+    return {
+        day: values for day, values in days.items()
+        if all(name in values for name in parameters)
+    }
@@ -0,0 +1,92 @@
+"""
+Open-Meteo forecast client.
+
+`fetch_forecast` gets one location; `fetch_forecasts` gets many in a single
+request (Open-Meteo accepts comma-separated latitude/longitude lists and
+answers with one object per location, in order). Both return the dashboard
+shape built by `parse_forecast`.
+
+OPEN_METEO_URL can point at a local stub server for testing. Requests go
+through backend.http_client (pooled, with timeouts, retries and a circuit
+breaker).
+"""
+import os
+
+from backend import http_client
+
+OPEN_METEO_URL = os.environ.get("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+
+CURRENT_FIELDS = ["temperature_2m", "wind_speed_10m", "relative_humidity_2m"]
+DAILY_FIELDS = ["temperature_2m_max", "temperature_2m_min", "precipitation_sum"]
+
+
+def _params(latitude, longitude):
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current": CURRENT_FIELDS,
+        "daily": DAILY_FIELDS,
+        "timezone": "auto",
+        "forecast_days": 7
+    }
+
+
+def parse_forecast(data):
+    current = data.get("current", {})
+    daily = data.get("daily", {})
+
+    forecast = []
+    for i in range(len(daily.get("time", []))):
+        forecast.append({
+            "date": daily["time"][i],
+            "temp_max": daily["temperature_2m_max"][i],
+            "temp_min": daily["temperature_2m_min"][i],
+            "precipitation": daily["precipitation_sum"][i]
+        })
+
+    return {
+        "current_weather": {
+            "time": current.get("time"),
+            "temperature": current.get("temperature_2m"),
+            "wind_speed": current.get("wind_speed_10m"),
+            "humidity": current.get("relative_humidity_2m"),
+            "unit": "°C"
+        },
+        "seven_day_forecast": forecast
+    }
+
+
+def fetch_forecast(lat, lon, url=None, timeout=None):
+    """Current conditions + 7-day forecast for one location."""
+    response = http_client.get(url or OPEN_METEO_URL, params=_params(lat, lon),
+                               timeout=timeout)
+    response.raise_for_status()
+    return parse_forecast(response.json())
+
+
+def fetch_forecasts(coords, url=None, timeout=None):
+    """
+    Forecasts for a list of (lat, lon) pairs in one upstream request.
+    Returns a list in the same order as `coords`.
+    """
+    if not coords:
+        return []
+
+    response = http_client.get(
+        url or OPEN_METEO_URL,
+        params=_params(
+            ",".join(str(lat) for lat, _ in coords),
+            ",".join(str(lon) for _, lon in coords)
+        ),
+        timeout=timeout
+    )
+    response.raise_for_status()
+    data = response.json()
+
+    # A single location comes back as an object rather than a list
+    if isinstance(data, dict):
+        data = [data]
+    if len(data) != len(coords):
+        raise ValueError(f"Expected {len(coords)} locations, got {len(data)}")
+
+    return [parse_forecast(item) for item in data]
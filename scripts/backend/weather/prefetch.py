@@ -0,0 +1,155 @@
+"""
+Background weather prefetch for every district centroid.
+
+Farmer coordinates are always one of the KARNATAKA_DISTRICTS centroids, so
+the whole state is 21 locations. A daemon thread fetches all of them in one
+batched Open-Meteo request every WEATHER_PREFETCH_INTERVAL seconds and
+publishes the result as an immutable snapshot; request handlers read the
+snapshot with a dict lookup and no network I/O.
+
+If a refresh fails the previous snapshot stays in place and the refresh is
+retried after WEATHER_PREFETCH_RETRY seconds. Once the snapshot is older
+than WEATHER_PREFETCH_MAX_AGE, get() returns None and callers fall back to
+their own fetch path (WeatherCache in app.py).
+
+Each refresh is also written into the WeatherCache passed in, which keeps
+the on-disk tier warm for restarted or sibling workers.
+
+With autostart=True the thread is started by the first lookup in each
+process, so workers forked after import (gunicorn) run their own.
+"""
+import os
+import threading
+import time
+
+from backend.districts import KARNATAKA_DISTRICTS
+from backend.weather.cache import WEATHER_CACHE_STALE_TTL, coord_key
+from backend.weather.open_meteo import fetch_forecasts
+
+WEATHER_PREFETCH = os.environ.get("WEATHER_PREFETCH", "1") != "0"
+WEATHER_PREFETCH_INTERVAL = float(os.environ.get("WEATHER_PREFETCH_INTERVAL", 600))
+WEATHER_PREFETCH_RETRY = float(os.environ.get("WEATHER_PREFETCH_RETRY", 60))
+WEATHER_PREFETCH_MAX_AGE = float(os.environ.get("WEATHER_PREFETCH_MAX_AGE", WEATHER_CACHE_STALE_TTL))
+
+_EMPTY = {"fetched_at": 0, "by_key": {}, "by_name": {}}
+
+
+class WeatherPrefetcher:
+    def __init__(self, locations=None, interval=WEATHER_PREFETCH_INTERVAL,
+                 retry_interval=WEATHER_PREFETCH_RETRY, max_age=WEATHER_PREFETCH_MAX_AGE,
+                 fetch=fetch_forecasts, cache=None, autostart=False):
+        if locations is None:
+            locations = {
+                name: (c["lat"], c["lon"]) for name, c in KARNATAKA_DISTRICTS.items()
+            }
+        self.locations = dict(locations)
+        self.interval = interval
+        self.retry_interval = min(retry_interval, interval)
+        self.max_age = max_age
+        self.fetch = fetch
+        self.cache = cache
+        self.autostart = autostart
+
+        # Replaced wholesale on refresh, never mutated, so readers need no lock
+        self._snapshot = _EMPTY
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "refreshes": 0, "refresh_errors": 0, "last_error": None,
+            "last_duration_ms": None, "hits": 0, "misses": 0,
+        }
+
+    # ------------------------------------------------------------------
+    def start(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the parent's thread did not come along
+                self._thread = None
+                self._pid = os.getpid()
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="weather-prefetch", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def _running(self):
+        return self._pid == os.getpid() and self._thread is not None
+
+    def stop(self):
+        if not self._running():
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def refresh(self):
+        """Fetch every location in one request. Returns True on success."""
+        names = list(self.locations)
+        coords = [self.locations[name] for name in names]
+
+        start = time.perf_counter()
+        try:
+            results = self.fetch(coords)
+        except Exception as e:
+            with self._lock:
+                self._stats["refresh_errors"] += 1
+                self._stats["last_error"] = str(e)
+            print(f"WARNING: Weather prefetch failed, keeping last snapshot: {e}")
+            return False
+
+        fetched_at = time.time()
+        by_key, by_name = {}, {}
+        for name, (lat, lon), value in zip(names, coords, results):
+            by_key[coord_key(lat, lon)] = value
+            by_name[name] = value
+
+        self._snapshot = {"fetched_at": fetched_at, "by_key": by_key, "by_name": by_name}
+
+        if self.cache is not None:
+            for key, value in by_key.items():
+                self.cache.put(key, value, fetched_at)
+
+        with self._lock:
+            self._stats["refreshes"] += 1
+            self._stats["last_error"] = None
+            self._stats["last_duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return True
+
+    def get(self, lat, lon):
+        """Prefetched weather for a centroid, or None if unknown / too old."""
+        return self._read("by_key", coord_key(lat, lon))
+
+    def get_district(self, district):
+        return self._read("by_name", district)
+
+    def stats(self):
+        snapshot = self._snapshot
+        with self._lock:
+            stats = dict(self._stats)
+        stats["locations"] = len(snapshot["by_key"])
+        stats["age_seconds"] = round(time.time() - snapshot["fetched_at"], 1) \
+            if snapshot["fetched_at"] else None
+        stats["running"] = self._running()
+        return stats
+
+    # ------------------------------------------------------------------
+    def _read(self, index, key):
+        if self.autostart and not self._running():
+            self.start()
+        snapshot = self._snapshot
+        value = snapshot[index].get(key)
+        if value is not None and time.time() - snapshot["fetched_at"] > self.max_age:
+            value = None
+        with self._lock:
+            self._stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def _run(self):
+        while not self._stop.is_set():
+            ok = self.refresh()
+            self._stop.wait(self.interval if ok else self.retry_interval)
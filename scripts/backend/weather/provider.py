@@ -0,0 +1,189 @@
+"""
+One entry point for weather, whatever the caller needs it for.
+
+- forecast(lat, lon):           dashboard forecast (current + 7 days)
+- conditions(lat, lon, day):    temperature / humidity for one day as a
+                                WeatherReading, used by shelf-life models
+
+conditions() asks its sources in order and returns the first answer:
+
+    OpenMeteoSource          today      current conditions from the forecast
+    NasaPowerSource          past days  NASA POWER daily observations
+    ClimatologyTableSource   any day    precomputed per-district table
+                                        (backend/weather/climatology.py)
+    ClimatologySource        any day    same date in past years, fetched live;
+                                        only reached when the table is missing
+                                        or the location is not a district
+
+and finally DEFAULT_TEMPERATURE / DEFAULT_HUMIDITY (Karnataka averages).
+Forecasts go through the shared WeatherCache and observations through the
+local archive (backend/weather/archive.py), so the dashboard and a
+shelf-life prediction for the same district and day share one upstream
+fetch. Sources are plain objects with `name`, `covers(day, today)` and
+`read(provider, lat, lon, day)`; pass a different list to change them.
+"""
+from dataclasses import dataclass
+from datetime import date
+
+from backend.weather.archive import HistoryArchive
+from backend.weather.cache import WeatherCache, coord_key
+from backend.weather.climatology import ClimatologyTable
+from backend.weather.open_meteo import fetch_forecast
+
+DEFAULT_TEMPERATURE = 28.0
+DEFAULT_HUMIDITY = 65.0
+
+CLIMATOLOGY_YEARS = 10
+
+
+@dataclass(frozen=True)
+class WeatherReading:
+    day: date
+    temperature: float     # °C
+    humidity: float        # % relative humidity
+    source: str
+
+    def to_dict(self):
+        return {
+            "date": self.day.isoformat(),
+            "temperature": self.temperature,
+            "humidity": self.humidity,
+            "source": self.source
+        }
+
+
+class WeatherUnavailable(LookupError):
+    """No source could answer for the requested day."""
+
+
+# ==========================================================
+# SOURCES
+# ==========================================================
+class OpenMeteoSource:
+    name = "open-meteo"
+
+    def covers(self, day, today):
+        return day == today
+
+    def read(self, provider, lat, lon, day):
+        current = provider.forecast(lat, lon)["current_weather"]
+        if current.get("temperature") is None or current.get("humidity") is None:
+            raise WeatherUnavailable("Open-Meteo returned no current conditions")
+        return current["temperature"], current["humidity"]
+
+
+class NasaPowerSource:
+    name = "nasa-power"
+
+    def covers(self, day, today):
+        return day < today
+
+    def read(self, provider, lat, lon, day):
+        values = provider.observed(lat, lon, day)
+        if values is None:
+            raise WeatherUnavailable(f"No NASA POWER data for {day}")
+        return values["T2M"], values["RH2M"]
+
+
+class ClimatologyTableSource:
+    name = "climatology"
+
+    def __init__(self, table=None):
+        self.table = table or ClimatologyTable()
+
+    def covers(self, day, today):
+        return True
+
+    def read(self, provider, lat, lon, day):
+        values = self.table.lookup(day, lat=lat, lon=lon)
+        if values is None:
+            raise WeatherUnavailable("No precomputed climatology for this location")
+        return values["T2M"], values["RH2M"]
+
+
+class ClimatologySource:
+    name = "climatology-live"
+
+    def __init__(self, years=CLIMATOLOGY_YEARS):
+        self.years = years
+
+    def covers(self, day, today):
+        return True
+
+    def read(self, provider, lat, lon, day):
+        temps, humidities = [], []
+        last_year = date.today().year - 1
+        for year in range(last_year - self.years + 1, last_year + 1):
+            try:
+                same_day = day.replace(year=year)
+            except ValueError:      # 29 February
+                same_day = date(year, 2, 28)
+            try:
+                values = provider.observed(lat, lon, same_day)
+            except Exception:
+                continue
+            if values:
+                temps.append(values["T2M"])
+                humidities.append(values["RH2M"])
+
+        if not temps:
+            raise WeatherUnavailable("Unable to compute climatology")
+        return sum(temps) / len(temps), sum(humidities) / len(humidities)
+
+
+DEFAULT_SOURCES = (
+    OpenMeteoSource(), NasaPowerSource(), ClimatologyTableSource(), ClimatologySource()
+)
+
+
+# ==========================================================
+# PROVIDER
+# ==========================================================
+class WeatherProvider:
+    def __init__(self, cache=None, prefetcher=None, sources=DEFAULT_SOURCES, archive=None):
+        self.cache = cache if cache is not None else WeatherCache()
+        self.prefetcher = prefetcher
+        self.sources = list(sources)
+        self.archive = archive if archive is not None else HistoryArchive()
+
+    def forecast(self, lat, lon):
+        """
+        Dashboard forecast: prefetched snapshot first, then the cache.
+        Raises requests' RequestException when upstream fails with nothing cached.
+        """
+        if self.prefetcher is not None:
+            prefetched = self.prefetcher.get(lat, lon)
+            if prefetched is not None:
+                return prefetched
+        return self.cache.get(coord_key(lat, lon), lambda: fetch_forecast(lat, lon))
+
+    def observed(self, lat, lon, day):
+        """
+        NASA POWER observation for a past day ({"T2M", "RH2M"}), or None.
+        Served from the local archive, which fetches whole years on demand.
+        """
+        return self.archive.observed(lat, lon, day)
+
+    def conditions(self, lat, lon, day=None, fallback=True):
+        """
+        WeatherReading for `day` (default today). With fallback=False,
+        raises WeatherUnavailable instead of returning the defaults.
+        """
+        today = date.today()
+        day = day or today
+        errors = []
+        for source in self.sources:
+            if not source.covers(day, today):
+                continue
+            try:
+                temperature, humidity = source.read(self, lat, lon, day)
+            except Exception as e:
+                errors.append(f"{source.name}: {e}")
+                continue
+            return WeatherReading(day, float(temperature), float(humidity), source.name)
+
+        if not fallback:
+            raise WeatherUnavailable("; ".join(errors) or f"No weather source for {day}")
+        if errors:
+            print(f"WARNING: Using default weather for {day}: {'; '.join(errors)}")
+        return WeatherReading(day, DEFAULT_TEMPERATURE, DEFAULT_HUMIDITY, "default")